@@ -0,0 +1,260 @@
+from fastapi import Request, Response
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.inmemory import InMemoryBackend
+from fastapi_cache.backends.redis import RedisBackend
+from fastapi_cache.coder import JsonCoder
+from redis import asyncio as aioredis
+from api.respuestas import RespuestaJSONSerializada
+from typing import Callable, Optional, Union
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+
+logger = logging.getLogger(__name__)
+
+REDIS_URL = os.getenv("REDIS_URL")
+
+PREFIJO_CACHE = "chenchen"
+
+# Políticas de expiración (segundos) según la frecuencia de cambio de los datos
+EXPIRACION_CORTA = 5      # Listas de cuentas (el saldo cambia con cada transacción)
+# Versiones de namespace: expiración explícita porque InMemoryBackend trata
+# expire=None como 0 (la versión caducaría en un segundo). Al caducar solo
+# se genera una versión nueva.
+EXPIRACION_VERSION = 30 * 86400
+
+# Namespaces para invalidar por recurso
+NAMESPACE_CUENTAS = "cuentas"
+NAMESPACE_CATEGORIAS = "categorias"
+
+def iniciar_cache():
+    """
+    Inicializar FastAPICache.
+
+    Usa Redis cuando REDIS_URL está configurada; en desarrollo sin Redis
+    se usa un backend en memoria por proceso.
+    Retorna el cliente de Redis (o None) para cerrarlo al apagar la app.
+    """
+    if REDIS_URL:
+        redis = aioredis.from_url(REDIS_URL)
+        FastAPICache.init(RedisBackend(redis), prefix=PREFIJO_CACHE, key_builder=construir_clave_cache)
+        return redis
+
+    FastAPICache.init(InMemoryBackend(), prefix=PREFIJO_CACHE, key_builder=construir_clave_cache)
+    return None
+
+def construir_clave_cache(
+    func: Callable,
+    namespace: Optional[str] = "",
+    request: Optional[Request] = None,
+    response: Optional[Response] = None,
+    args: Optional[tuple] = None,
+    kwargs: Optional[dict] = None,
+) -> str:
+    """
+    Construir la clave de caché a partir de la ruta y los parámetros de consulta.
+
+    Los parámetros (incluido usuario_id) forman parte del hash, así las
+    respuestas de un usuario nunca se sirven a otro. No se usan los kwargs
+    del endpoint porque incluyen la sesión de base de datos.
+    """
+    parametros = sorted(request.query_params.multi_items()) if request else []
+    ruta = request.url.path if request else f"{func.__module__}:{func.__name__}"
+    digest = hashlib.md5(f"{ruta}:{parametros}".encode()).hexdigest()
+    return f"{FastAPICache.get_prefix()}:{namespace}:{digest}"
+
+class CoderRespuestaSerializada(JsonCoder):
+    """
+    Coder para endpoints que devuelven RespuestaJSONSerializada.
+
+    JsonCoder ya guarda el cuerpo JSON tal cual; un acierto lo devuelve como
+    respuesta ya serializada en lugar de decodificarlo a dicts, así FastAPI
+    no lo vuelve a validar contra response_model (igual que en un fallo).
+    """
+
+    @classmethod
+    def decode(cls, value: Union[bytes, str]) -> RespuestaJSONSerializada:
+        return RespuestaJSONSerializada(value.encode() if isinstance(value, str) else value)
+
+def _clave_version(namespace: str) -> str:
+    return f"{PREFIJO_CACHE}:version:{namespace}"
+
+async def version_namespace(namespace: str) -> Optional[str]:
+    """
+    Versión actual de los datos de un namespace, compartida entre procesos.
+
+    Cambia cada vez que se invalida el namespace, así que sirve como ETag y
+    como parte de la clave de cachés locales al proceso. Si la versión no
+    existe (primer uso o Redis vaciado) se crea una nueva, nunca se reutiliza
+    una anterior. Retorna None si el backend no responde.
+    """
+    try:
+        backend = FastAPICache.get_backend()
+        version = await backend.get(_clave_version(namespace))
+        if version is None:
+            version = str(time.time_ns())
+            await backend.set(_clave_version(namespace), version, EXPIRACION_VERSION)
+    except Exception:
+        logger.warning("No se pudo leer la versión de la caché '%s'", namespace, exc_info=True)
+        return None
+    return version.decode() if isinstance(version, bytes) else version
+
+async def invalidar_cache(*namespaces: str):
+    """
+    Eliminar las entradas de caché de los namespaces indicados y cambiar su versión.
+
+    Un fallo de Redis no debe tumbar una escritura ya confirmada en la base
+    de datos; las entradas expiran solas por su TTL.
+    """
+    for namespace in namespaces:
+        try:
+            await FastAPICache.clear(namespace=namespace)
+            await FastAPICache.get_backend().set(_clave_version(namespace), str(time.time_ns()), EXPIRACION_VERSION)
+        except Exception:
+            logger.warning("No se pudo invalidar la caché '%s'", namespace, exc_info=True)
+
+class StaleWhileRevalidateMiddleware:
+    """
+    Middleware ASGI con política stale-while-revalidate para endpoints de resumen.
+
+    - Entrada fresca: se responde desde caché.
+    - Entrada vencida pero dentro de la expiración dura: se responde desde
+      caché y se recalcula en segundo plano.
+    - Si el cálculo falla (p. ej. Postgres no responde) se sirve la última
+      entrada conocida con el encabezado X-Cache: stale-fallback.
+
+    rutas: lista de (regex, namespace, segundos_fresco, segundos_expiracion_dura).
+    Las entradas se guardan bajo el namespace, así invalidar_cache las
+    elimina junto con las del decorador @cache del mismo recurso.
+    """
+
+    # Tiempo que se conserva la última respuesta buena para usarla como respaldo
+    RETENCION_RESPALDO = 86400
+
+    def __init__(self, app, rutas: list):
+        self.app = app
+        self.rutas = [(re.compile(patron), namespace, fresco, duro) for patron, namespace, fresco, duro in rutas]
+        self._en_refresco = set()
+        # asyncio solo guarda referencias débiles a las tareas: sin esta, un
+        # refresco en curso podría ser recolectado antes de terminar
+        self._tareas_refresco = set()
+
+    def _politica(self, ruta: str):
+        for patron, namespace, fresco, duro in self.rutas:
+            if patron.fullmatch(ruta):
+                return namespace, (fresco, duro)
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        encontrada = self._politica(scope["path"])
+        if encontrada is None:
+            await self.app(scope, receive, send)
+            return
+
+        namespace, politica = encontrada
+        clave = f"{PREFIJO_CACHE}:{namespace}:swr:{scope['path']}?{scope['query_string'].decode('latin-1')}"
+        entrada = await self._leer(clave)
+        ahora = time.time()
+
+        if entrada and ahora < entrada["stale_en"]:
+            await self._enviar(send, entrada, "HIT")
+            return
+
+        if entrada and ahora < entrada["expira_en"]:
+            await self._enviar(send, entrada, "STALE")
+            if clave not in self._en_refresco:
+                self._en_refresco.add(clave)
+                tarea = asyncio.create_task(self._refrescar(scope, clave, politica))
+                self._tareas_refresco.add(tarea)
+                tarea.add_done_callback(self._tareas_refresco.discard)
+            return
+
+        try:
+            nueva = await self._calcular(scope, receive, clave, politica)
+        except Exception:
+            if entrada is None:
+                raise
+            await self._enviar(send, entrada, "stale-fallback")
+            return
+
+        if nueva["status"] >= 500 and entrada is not None:
+            await self._enviar(send, entrada, "stale-fallback")
+            return
+
+        await self._enviar(send, nueva, "MISS")
+
+    async def _calcular(self, scope, receive, clave: str, politica) -> dict:
+        """Ejecutar el endpoint capturando la respuesta y guardarla si es exitosa"""
+        estado = {"status": 500, "headers": [], "body": b""}
+
+        async def capturar(mensaje):
+            if mensaje["type"] == "http.response.start":
+                estado["status"] = mensaje["status"]
+                estado["headers"] = [
+                    [nombre.decode("latin-1"), valor.decode("latin-1")]
+                    for nombre, valor in mensaje.get("headers", [])
+                ]
+            elif mensaje["type"] == "http.response.body":
+                estado["body"] += mensaje.get("body", b"")
+
+        await self.app(scope, receive, capturar)
+
+        fresco, duro = politica
+        generado_en = time.time()
+        entrada = {
+            "generado_en": generado_en,
+            "stale_en": generado_en + fresco,
+            "expira_en": generado_en + duro,
+            "status": estado["status"],
+            "headers": estado["headers"],
+            "body": base64.b64encode(estado["body"]).decode("ascii"),
+        }
+        if estado["status"] == 200:
+            await self._guardar(clave, entrada, duro)
+        return entrada
+
+    async def _refrescar(self, scope, clave: str, politica):
+        """Recalcular una entrada vencida sin bloquear la respuesta al cliente"""
+        async def recibir_vacio():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        try:
+            await self._calcular(dict(scope), recibir_vacio, clave, politica)
+        except Exception:
+            logger.warning("No se pudo refrescar la caché '%s'", clave, exc_info=True)
+        finally:
+            self._en_refresco.discard(clave)
+
+    async def _leer(self, clave: str) -> Optional[dict]:
+        try:
+            valor = await FastAPICache.get_backend().get(clave)
+        except Exception:
+            logger.warning("No se pudo leer la caché '%s'", clave, exc_info=True)
+            return None
+        return json.loads(valor) if valor else None
+
+    async def _guardar(self, clave: str, entrada: dict, duro: int):
+        try:
+            await FastAPICache.get_backend().set(clave, json.dumps(entrada), duro + self.RETENCION_RESPALDO)
+        except Exception:
+            logger.warning("No se pudo guardar la caché '%s'", clave, exc_info=True)
+
+    @staticmethod
+    async def _enviar(send, entrada: dict, estado_cache: str):
+        headers = [
+            (nombre.encode("latin-1"), valor.encode("latin-1"))
+            for nombre, valor in entrada["headers"]
+            if nombre.lower() != "x-cache"
+        ]
+        headers.append((b"x-cache", estado_cache.encode("latin-1")))
+        await send({"type": "http.response.start", "status": entrada["status"], "headers": headers})
+        await send({"type": "http.response.body", "body": base64.b64decode(entrada["body"])})
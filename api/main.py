@@ -1,11 +1,52 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.openapi.docs import get_redoc_html, get_swagger_ui_html
+from api.cache import NAMESPACE_CUENTAS, StaleWhileRevalidateMiddleware, iniciar_cache
+from api.database import calentar_pool, crear_engine, crear_sessionmaker
+from api.models import registrar_modelos
+from api.respuestas import RespuestaORJSON
 from api.routes import usuarios, cuentas, categorias, transacciones
+from api.services.categoria_ajuste import precargar_categoria_ajuste
+import orjson
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Inicio: registrar los modelos y crear el engine async y la fábrica de sesiones
+    registrar_modelos()
+    engine = crear_engine()
+    app.state.engine = engine
+    app.state.sessionmaker = crear_sessionmaker(engine)
+    await calentar_pool(engine)
+    redis = iniciar_cache()
+    await precargar_categoria_ajuste(app.state.sessionmaker)
+    # Esquema OpenAPI generado y serializado una sola vez, fuera del camino de las peticiones
+    app.state.openapi_bytes = orjson.dumps(app.openapi())
+    yield
+    # Cierre: liberar las conexiones del pool
+    await engine.dispose()
+    if redis is not None:
+        await redis.close()
 
 app = FastAPI(
     title="ChenChen API",
     description="API para gestión de finanzas personales",
-    version="0.1.0"
+    version="0.1.0",
+    default_response_class=RespuestaORJSON,
+    lifespan=lifespan,
+    # /openapi.json y la documentación se sirven abajo con el esquema precalculado
+    openapi_url=None,
+    docs_url=None,
+    redoc_url=None
+)
+
+# Caché stale-while-revalidate para resúmenes: (ruta, namespace, segundos fresco, expiración dura).
+# /health no se cachea: una respuesta guardada ocultaría una caída.
+app.add_middleware(
+    StaleWhileRevalidateMiddleware,
+    rutas=[
+        (r"/cuentas/usuario/\d+/resumen", NAMESPACE_CUENTAS, 5, 60),
+    ],
 )
 
 # Configuración de CORS
@@ -23,6 +64,18 @@ app.include_router(cuentas.router)
 app.include_router(categorias.router)
 app.include_router(transacciones.router)
 
+@app.get("/openapi.json", include_in_schema=False)
+async def openapi_json(request: Request):
+    return Response(request.app.state.openapi_bytes, media_type="application/json")
+
+@app.get("/docs", include_in_schema=False)
+async def swagger_ui():
+    return get_swagger_ui_html(openapi_url="/openapi.json", title=f"{app.title} - Swagger UI")
+
+@app.get("/redoc", include_in_schema=False)
+async def redoc():
+    return get_redoc_html(openapi_url="/openapi.json", title=f"{app.title} - ReDoc")
+
 @app.get("/")
 async def root():
     return {"message": "Bienvenido a ChenChen API"}
@@ -1,14 +1,25 @@
-from api.models.usuario import Usuario
-from api.models.cuenta import Cuenta
-from api.models.categoria import Categoria
-from api.models.transaccion import Transaccion
-from api.models.subcuenta import Subcuenta
-from api.models.movimiento_subcuenta import MovimientoSubcuenta
-from api.models.deuda import Deuda
-from api.models.compromiso_recurrente import CompromisoRecurrente
-from api.models.plan_quincenal import PlanQuincenal
-from api.models.movimiento_deuda import MovimientoDeuda
-from api.models.gasto_planificado import GastoPlanificado
-    
-
-__all__ = ["Usuario", "Cuenta", "Categoria", "Transaccion", "Subcuenta", "MovimientoSubcuenta", "Deuda", "CompromisoRecurrente", "PlanQuincenal", "MovimientoDeuda", "GastoPlanificado"]
\ No newline at end of file
+from importlib import import_module
+import re
+
+__all__ = ["Usuario", "Cuenta", "Categoria", "Transaccion", "Subcuenta", "MovimientoSubcuenta", "Deuda", "CompromisoRecurrente", "PlanQuincenal", "MovimientoDeuda", "GastoPlanificado", "Moneda"]
+
+def _modulo_de(nombre: str) -> str:
+    """Nombre del módulo de un modelo: MovimientoSubcuenta -> movimiento_subcuenta"""
+    return re.sub(r'(?<!^)(?=[A-Z])', '_', nombre).lower()
+
+def __getattr__(nombre: str):
+    # Importación perezosa: `from api.models import Cuenta` solo carga cuenta.py
+    if nombre in __all__:
+        return getattr(import_module(f"{__name__}.{_modulo_de(nombre)}"), nombre)
+    raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
+
+def registrar_modelos():
+    """
+    Importar todos los modelos.
+
+    Las relaciones se declaran por nombre ("Cuenta", "Subcuenta", ...), así
+    que todos los modelos deben estar registrados en Base antes de la
+    primera consulta. Se llama una vez al arrancar la aplicación.
+    """
+    for nombre in __all__:
+        import_module(f"{__name__}.{_modulo_de(nombre)}")
@@ -1,9 +1,10 @@
-from sqlalchemy import Column, BigInteger, String, Boolean, DateTime, Integer, Text, ForeignKey, CheckConstraint
+from sqlalchemy import Column, BigInteger, String, Boolean, DateTime, Integer, Text, ForeignKey, CheckConstraint, FetchedValue, Index, text
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from api.database import Base
+from api.models.tipos import ColorHexMixin
 
-class Categoria(Base):
+class Categoria(ColorHexMixin, Base):
     __tablename__ = "categorias"
 
     # Clave primaria
@@ -26,12 +27,13 @@ class Categoria(Base):
     
     # Auditoría
     creada_en = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    actualizada_en = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    actualizada_en = Column(DateTime(timezone=True), server_default=func.now(), server_onupdate=FetchedValue(), nullable=False)
     
     # Relaciones
     # Relación auto-referencial (categoría padre)
     categoria_padre = relationship("Categoria", remote_side=[categoria_id], back_populates="subcategorias")
-    subcategorias = relationship("Categoria", back_populates="categoria_padre", lazy="dynamic")
+    # Carga por defecto (lazy="select"): selectin recorrería todo el árbol en cada carga
+    subcategorias = relationship("Categoria", back_populates="categoria_padre", passive_deletes="all")
     
     # Relación con transacciones
     transacciones = relationship("Transaccion", back_populates="categoria", lazy="dynamic")
@@ -40,6 +42,12 @@ class Categoria(Base):
     __table_args__ = (
         CheckConstraint("tipo_transaccion IN ('INGRESO', 'GASTO', 'TRANSFERENCIA', 'AJUSTE')", name='check_tipo_transaccion_valido'),
         CheckConstraint("LENGTH(TRIM(nombre)) > 0", name='check_nombre_no_vacio'),
-        CheckConstraint("color_hex ~ '^#[0-9A-Fa-f]{6}$'", name='check_color_hex_valido'),
+        CheckConstraint("es_color_hex(color_hex)", name='check_color_hex_valido'),
         CheckConstraint("categoria_padre_id != categoria_id", name='check_no_auto_referencia'),
+        # Índices (definidos en database/V002)
+        Index(
+            'idx_categorias_nombre_unico',
+            func.lower(nombre), 'tipo_transaccion', func.coalesce(categoria_padre_id, 0),
+            unique=True, postgresql_where=text('activa = TRUE')
+        ),
     )
@@ -1,9 +1,10 @@
-from sqlalchemy import Column, Integer, BigInteger, String, Boolean, DateTime, Date, Numeric, Text, ForeignKey, CheckConstraint
+from sqlalchemy import Column, Integer, BigInteger, String, Boolean, DateTime, Date, Text, ForeignKey, CheckConstraint, FetchedValue, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from api.database import Base
+from api.models.tipos import ColorHexMixin, Dinero, FrecuenciaCompromiso, TipoCompromiso
 
-class CompromisoRecurrente(Base):
+class CompromisoRecurrente(ColorHexMixin, Base):
     __tablename__ = 'compromisos_recurrentes'
 
     # Clave primaria
@@ -15,12 +16,12 @@ class CompromisoRecurrente(Base):
     
     # Datos principales
     descripcion = Column(Text, nullable=False)
-    tipo = Column(String(20), nullable=False)
+    tipo = Column(TipoCompromiso, nullable=False)
     categoria = Column(String(100), nullable=True)
     
     # Monto y frecuencia
-    monto = Column(Numeric(15, 2), nullable=False)
-    frecuencia = Column(String(30), nullable=False)
+    monto = Column(Dinero, nullable=False)
+    frecuencia = Column(FrecuenciaCompromiso, nullable=False)
     dia_pago = Column(Integer, nullable=True)
     
     # Fechas
@@ -39,7 +40,7 @@ class CompromisoRecurrente(Base):
     
     # Auditoria
     creado_en = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
-    actualizado_en = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+    actualizado_en = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), server_onupdate=FetchedValue())
     
     # Relaciones con otros modelos
     usuario = relationship("Usuario", back_populates="compromisos_recurrentes")
@@ -48,14 +49,6 @@ class CompromisoRecurrente(Base):
 
     # Constraints
     __table_args__ = (
-        CheckConstraint(
-            "tipo IN ('INGRESO', 'EGRESO')",
-            name='check_tipo_valido'
-        ),
-        CheckConstraint(
-            "frecuencia IN ('DIARIA', 'SEMANAL', 'QUINCENAL', 'MENSUAL', 'BIMESTRAL', 'TRIMESTRAL', 'SEMESTRAL', 'ANUAL')",
-            name='check_frecuencia_valida'
-        ),
         CheckConstraint(
             "LENGTH(TRIM(descripcion)) > 0",
             name='check_descripcion_no_vacia'
@@ -73,7 +66,9 @@ class CompromisoRecurrente(Base):
             name='check_fecha_fin_posterior'
         ),
         CheckConstraint(
-            "color_hex ~ '^#[0-9A-Fa-f]{6}$'",
+            "es_color_hex(color_hex)",
             name='check_color_hex_valido'
         ),
+        # Índices (definidos en database/V013)
+        Index('idx_compromisos_usuario_activo_dia', 'usuario_id', 'activo', 'dia_pago'),
     )
@@ -1,9 +1,10 @@
-from sqlalchemy import Column, BigInteger, String, Boolean, DateTime, Numeric, Integer, Text, ForeignKey, CheckConstraint
+from sqlalchemy import Column, BigInteger, String, Boolean, DateTime, Numeric, Integer, Text, ForeignKey, CheckConstraint, FetchedValue, Index, text
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from api.database import Base
+from api.models.tipos import ColorHexMixin, Dinero, TipoCuenta
 
-class Cuenta(Base):
+class Cuenta(ColorHexMixin, Base):
     __tablename__ = "cuentas"
 
     # Clave primaria
@@ -14,14 +15,14 @@ class Cuenta(Base):
     
     # Datos principales
     nombre = Column(String(100), nullable=False)
-    tipo_cuenta = Column(String(30), nullable=False)
+    tipo_cuenta = Column(TipoCuenta, nullable=False)
     institucion = Column(String(100), nullable=True)
     numero_cuenta = Column(String(50), nullable=True)
-    moneda = Column(String(3), nullable=False, default='USD')
+    moneda = Column(String(3), ForeignKey('monedas.codigo', onupdate='CASCADE', ondelete='RESTRICT'), nullable=False, default='USD')
     
     # Saldos
-    saldo_actual = Column(Numeric(15, 2), nullable=False, default=0.00)
-    limite_credito = Column(Numeric(15, 2), nullable=True)
+    saldo_actual = Column(Dinero, nullable=False, default=0.00)
+    limite_credito = Column(Dinero, nullable=True)
     
     # Información de tarjetas
     dia_corte = Column(Integer, nullable=True)
@@ -41,7 +42,7 @@ class Cuenta(Base):
     
     # Auditoría
     creada_en = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    actualizada_en = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    actualizada_en = Column(DateTime(timezone=True), server_default=func.now(), server_onupdate=FetchedValue(), nullable=False)
     ultimo_movimiento = Column(DateTime(timezone=True), nullable=True)
     
     # Relaciones
@@ -50,24 +51,24 @@ class Cuenta(Base):
     
     usuario = relationship("Usuario", back_populates="cuentas")
 
-    subcuentas = relationship("Subcuenta", back_populates="cuenta", lazy="dynamic")
+    # Carga por defecto (lazy="select"): las consultas que las devuelven usan
+    # selectinload (ver consulta_cuenta_con_relaciones en api/routes/cuentas.py),
+    # el resto de cargas de Cuenta no pagan SELECT extra. El borrado lo resuelve
+    # la base de datos (ON DELETE), por eso passive_deletes="all" evita que el
+    # ORM intente desvincular los hijos.
+    subcuentas = relationship("Subcuenta", back_populates="cuenta", passive_deletes="all")
 
-    deudas = relationship("Deuda", back_populates="cuenta", lazy="dynamic")
+    deudas = relationship("Deuda", back_populates="cuenta", passive_deletes="all")
     
-    compromisos_recurrentes = relationship("CompromisoRecurrente", back_populates="cuenta_destino", lazy="dynamic")
+    compromisos_recurrentes = relationship("CompromisoRecurrente", back_populates="cuenta_destino", passive_deletes="all")
     
     plan_quincenal_origen = relationship("PlanQuincenal", foreign_keys="PlanQuincenal.cuenta_origen_id", back_populates="cuenta_origen", lazy="dynamic")
     plan_quincenal_destino = relationship("PlanQuincenal", foreign_keys="PlanQuincenal.cuenta_destino_id", back_populates="cuenta_destino", lazy="dynamic")
 
     # Constraints (validaciones de negocio)
     __table_args__ = (
-        CheckConstraint(
-            "tipo_cuenta IN ('EFECTIVO', 'CUENTA_CORRIENTE', 'CUENTA_AHORRO', 'CUENTA_NOMINA', 'TARJETA_CREDITO', 'TARJETA_DEBITO', 'INVERSION', 'PRESTAMO', 'WALLET_DIGITAL', 'CRIPTOMONEDA', 'OTRO')",
-            name='check_tipo_cuenta_valido'
-        ),
-        CheckConstraint("moneda ~ '^[A-Z]{3}$'", name='check_moneda_iso'),
         CheckConstraint("LENGTH(TRIM(nombre)) > 0", name='check_nombre_no_vacio'),
-        CheckConstraint("color_hex ~ '^#[0-9A-Fa-f]{6}$'", name='check_color_hex_valido'),
+        CheckConstraint("es_color_hex(color_hex)", name='check_color_hex_valido'),
         CheckConstraint(
             "(tipo_cuenta = 'TARJETA_CREDITO' AND limite_credito >= 0) OR (tipo_cuenta != 'TARJETA_CREDITO' AND limite_credito IS NULL)",
             name='check_limite_credito_logico'
@@ -75,4 +76,10 @@ class Cuenta(Base):
         CheckConstraint("dia_corte IS NULL OR (dia_corte BETWEEN 1 AND 31)", name='check_dia_corte_valido'),
         CheckConstraint("dia_pago IS NULL OR (dia_pago BETWEEN 1 AND 31)", name='check_dia_pago_valido'),
         CheckConstraint("tasa_interes IS NULL OR (tasa_interes BETWEEN 0 AND 100)", name='check_tasa_interes_valida'),
+        # Índices (definidos en database/V003, V013 y V017)
+        # Unicidad del nombre por usuario, sin distinguir mayúsculas y solo entre cuentas activas
+        Index('idx_cuentas_nombre_usuario_unico', 'usuario_id', func.lower(nombre), unique=True, postgresql_where=text('activa = TRUE')),
+        Index('idx_cuentas_usuario', 'usuario_id', 'orden_mostrar', postgresql_where=text('activa = TRUE')),
+        Index('idx_cuentas_usuario_activa', 'usuario_id', 'activa'),
+        Index('idx_cuentas_creada_en_brin', 'creada_en', postgresql_using='brin', postgresql_with={'pages_per_range': 32}),
     )
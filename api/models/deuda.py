@@ -1,31 +1,32 @@
-from sqlalchemy import Column, Integer, BigInteger, String, Boolean, DateTime, Date, Numeric, Text, ForeignKey, CheckConstraint
+from sqlalchemy import Column, Integer, BigInteger, String, Boolean, DateTime, Date, Numeric, Text, ForeignKey, CheckConstraint, FetchedValue, Index, text
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from api.database import Base
+from api.models.tipos import ColorHexMixin, Dinero, EstadoDeuda, TipoDeuda
 
-class Deuda(Base):
+class Deuda(ColorHexMixin, Base):
     __tablename__ = "deudas"
     
     # Clave primaria
     deuda_id = Column(BigInteger, primary_key=True, index=True)
 
     # Relaciones
-    usuario_id = Column(BigInteger, ForeignKey('usuarios.usuario_id', ondelete='CASCADE'), nullable=False, index=True)
+    usuario_id = Column(BigInteger, ForeignKey('usuarios.usuario_id', ondelete='CASCADE'), nullable=False)
     cuenta_id = Column(BigInteger, ForeignKey('cuentas.cuenta_id', ondelete='SET NULL'), nullable=True, index=True)
     subcuenta_id = Column(BigInteger, ForeignKey('subcuentas.subcuenta_id', ondelete='SET NULL'), nullable=True, index=True)
 
     # Datos principales
-    tipo = Column(String(30), nullable=False)  # 'PRESTAMO', 'TARJETA_CREDITO', etc.
+    tipo = Column(TipoDeuda, nullable=False)  # 'PRESTAMO', 'TARJETA_CREDITO', etc.
     acreedor = Column(String(150), nullable=True)
     deudor = Column(String(150), nullable=True)
     descripcion = Column(Text, nullable=True)
 
     # Montos
-    saldo_inicial = Column(Numeric(15, 2), nullable=False)
-    saldo_actual = Column(Numeric(15, 2), nullable=False)
+    saldo_inicial = Column(Dinero, nullable=False)
+    saldo_actual = Column(Dinero, nullable=False)
 
     # Información de pago
-    monto_cuota = Column(Numeric(15, 2), nullable=True)
+    monto_cuota = Column(Dinero, nullable=True)
     frecuencia_pago = Column(String(30), nullable=True)  # 'MENSUAL', 'QUINCENAL', etc.
     dia_pago = Column(Integer, nullable=True)
     tasa_interes = Column(Numeric(5, 2), nullable=True)
@@ -38,7 +39,7 @@ class Deuda(Base):
     proximo_pago = Column(Date, nullable=True)
 
     # Estado
-    estado = Column(String(20), nullable=False, default='ACTIVA')  # 'ACTIVA', 'PAGADA', 'CANCELADA'
+    estado = Column(EstadoDeuda, nullable=False, default='ACTIVA')  # 'ACTIVA', 'PAGADA', 'CANCELADA'
     prioridad = Column(String(20), nullable=True, default='MEDIA')  # 'BAJA', 'MEDIA', 'ALTA'
 
     # Configuración
@@ -47,7 +48,7 @@ class Deuda(Base):
 
     # Auditoría
     creada_en = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    actualizada_en = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    actualizada_en = Column(DateTime(timezone=True), server_default=func.now(), server_onupdate=FetchedValue(), nullable=False)
     ultimo_pago = Column(DateTime(timezone=True), nullable=True)
 
     # Relaciones
@@ -59,14 +60,6 @@ class Deuda(Base):
 
     # Constraints (validaciones de negocio)
     __table_args__ = (
-        CheckConstraint(
-            "tipo IN ('TARJETA', 'PRESTAMO', 'HIPOTECA', 'AUTO', 'POR_PAGAR', 'POR_COBRAR', 'OTRO')",
-            name='check_tipo_deuda_valido'
-        ),
-        CheckConstraint(
-            "estado IN ('ACTIVA', 'PAGADA', 'CANCELADA', 'VENCIDA', 'REFINANCIADA')",
-            name='check_estado_valido'
-        ),
         CheckConstraint(
             "prioridad in ('BAJA', 'MEDIA', 'ALTA')",
             name='check_prioridad_valida'
@@ -96,11 +89,15 @@ class Deuda(Base):
             name='check_cuotas_pagadas_validas'
         ),
         CheckConstraint(
-            "color_hex ~ '^#[0-9A-Fa-f]{6}$'",
+            "es_color_hex(color_hex)",
             name='check_color_hex_valido'
         ),
         CheckConstraint(
             "(tipo IN ('TARJETA', 'PRESTAMO', 'HIPOTECA', 'AUTO', 'POR_PAGAR') AND acreedor IS NOT NULL) OR (tipo = 'POR_COBRAR' AND deudor IS NOT NULL) OR (tipo = 'OTRO')",
             name='check_acreedor_deudor_logico'
         ),
-    )
\ No newline at end of file
+        # Índices (definidos en database/V008 y V017)
+        Index('idx_deudas_usuario', 'usuario_id', 'estado'),
+        Index('idx_deudas_proximo_pago', 'proximo_pago', postgresql_where=text("estado = 'ACTIVA' AND proximo_pago IS NOT NULL")),
+        Index('idx_deudas_creada_en_brin', 'creada_en', postgresql_using='brin', postgresql_with={'pages_per_range': 32}),
+    )
@@ -1,9 +1,10 @@
-from sqlalchemy import Column, Integer, BigInteger, String, Boolean, DateTime, Date, Numeric, Text, ForeignKey, CheckConstraint
+from sqlalchemy import Column, Integer, BigInteger, String, Boolean, DateTime, Date, Text, ForeignKey, CheckConstraint, FetchedValue, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from api.database import Base
+from api.models.tipos import ColorHexMixin, Dinero, EstadoGastoPlanificado, Prioridad
 
-class GastoPlanificado(Base):
+class GastoPlanificado(ColorHexMixin, Base):
     __tablename__ = 'gastos_planificados'
 
     # Clave primaria
@@ -17,8 +18,8 @@ class GastoPlanificado(Base):
     categoria = Column(String(100), nullable=True)
     
     # Montos
-    monto_total = Column(Numeric(15, 2), nullable=False)
-    monto_gastado = Column(Numeric(15, 2), nullable=False, default=0.00, server_default='0.00')
+    monto_total = Column(Dinero, nullable=False)
+    monto_gastado = Column(Dinero, nullable=False, default=0.00, server_default='0.00')
     
     # Fechas
     fecha_creacion = Column(Date, nullable=False, server_default=func.current_date())
@@ -26,8 +27,8 @@ class GastoPlanificado(Base):
     fecha_completado = Column(Date, nullable=True)
     
     # Estado
-    estado = Column(String(20), nullable=False, default='PENDIENTE', server_default='PENDIENTE')
-    prioridad = Column(String(20), nullable=True, default='MEDIA', server_default='MEDIA')
+    estado = Column(EstadoGastoPlanificado, nullable=False, default='PENDIENTE', server_default='PENDIENTE')
+    prioridad = Column(Prioridad, nullable=True, default='MEDIA', server_default='MEDIA')
     
     # Configuración
     color_hex = Column(String(7), nullable=False, default='#F59E0B', server_default='#F59E0B')
@@ -35,21 +36,13 @@ class GastoPlanificado(Base):
     
     # Auditoria
     creado_en = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
-    actualizado_en = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+    actualizado_en = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), server_onupdate=FetchedValue())
     
     # Relaciones con otros modelos
     subcuenta = relationship("Subcuenta", back_populates="gastos_planificados")
     
     # Constraints
     __table_args__ = (
-        CheckConstraint(
-            "estado IN ('PENDIENTE', 'EN_PROGRESO', 'COMPLETADO', 'CANCELADO', 'VENCIDO')",
-            name='check_estado_valido'
-        ),
-        CheckConstraint(
-            "prioridad IN ('ALTA', 'MEDIA', 'BAJA')",
-            name='check_prioridad_valida'
-        ),
         CheckConstraint(
             "LENGTH(TRIM(descripcion)) > 0",
             name='check_descripcion_no_vacia'
@@ -71,7 +64,9 @@ class GastoPlanificado(Base):
             name='check_fecha_completado_coherente'
         ),
         CheckConstraint(
-            "color_hex ~ '^#[0-9A-Fa-f]{6}$'",
+            "es_color_hex(color_hex)",
             name='check_color_hex_valido'
         ),
-    )
\ No newline at end of file
+        # Índices (definidos en database/V010)
+        Index('idx_gastos_planificados_subcuenta', 'subcuenta_id', 'estado'),
+    )
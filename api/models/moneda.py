@@ -0,0 +1,16 @@
+from sqlalchemy import Column, String, CheckConstraint
+from api.database import Base
+
+class Moneda(Base):
+    __tablename__ = "monedas"
+
+    # Clave primaria (código ISO 4217)
+    codigo = Column(String(3), primary_key=True)
+
+    # Datos principales
+    nombre = Column(String(100), nullable=False)
+
+    # Constraints (validaciones de negocio)
+    __table_args__ = (
+        CheckConstraint("codigo ~ '^[A-Z]{3}$'", name='check_codigo_iso'),
+    )
@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, BigInteger, String, Boolean, DateTime, Date, Numeric, Text, ForeignKey, CheckConstraint
+from sqlalchemy import Column, Integer, BigInteger, String, Boolean, DateTime, Date, Text, ForeignKey, CheckConstraint, Index, text
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from api.database import Base
+from api.models.tipos import Dinero, TipoMovimientoDeuda
 
 class MovimientoDeuda(Base):
     __tablename__ = "movimientos_deuda"
@@ -10,19 +11,19 @@ class MovimientoDeuda(Base):
     movimiento_deuda_id = Column(BigInteger, primary_key=True, index=True)
 
     # Relaciones
-    deuda_id = Column(BigInteger, ForeignKey('deudas.deuda_id', ondelete='RESTRICT'), nullable=False, index=True)
+    deuda_id = Column(BigInteger, ForeignKey('deudas.deuda_id', ondelete='RESTRICT'), nullable=False)
     transaccion_id = Column(BigInteger, ForeignKey('transacciones.transaccion_id', ondelete='RESTRICT'), nullable=False, index=True)
 
     # Datos principales
     fecha = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    tipo = Column(String(30), nullable=False) 
-    monto = Column(Numeric(15, 2), nullable=False)
+    tipo = Column(TipoMovimientoDeuda, nullable=False)
+    monto = Column(Dinero, nullable=False)
     descripcion = Column(Text, nullable=True)
 
     # Información adicional
-    interes_generado = Column(Numeric(15, 2), nullable=True)
-    capital_pagado = Column(Numeric(15, 2), nullable=True)
-    interes_pagado = Column(Numeric(15, 2), nullable=True)
+    interes_generado = Column(Dinero, nullable=True)
+    capital_pagado = Column(Dinero, nullable=True)
+    interes_pagado = Column(Dinero, nullable=True)
 
     # Auditoría
     creado_en = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -32,10 +33,6 @@ class MovimientoDeuda(Base):
     transaccion = relationship("Transaccion", back_populates="movimientos_deuda")
 
     __table_args__ = (
-        CheckConstraint(
-            "tipo IN ('CARGO', 'PAGO', 'AJUSTE', 'INTERES', 'REFINANCIACION')",
-            name='check_tipo_movimiento_valido'
-        ),
         CheckConstraint(
             "monto > 0",
             name='check_monto_positivo'
@@ -56,4 +53,7 @@ class MovimientoDeuda(Base):
             "tipo = 'INTERES' OR interes_generado = 0 OR interes_generado IS NULL",
             name='check_interes_generado_solo_en_interes'
         ),
-    )
\ No newline at end of file
+        # Índices (definidos en database/V009 y V017)
+        Index('idx_mov_deuda_deuda', 'deuda_id', text('fecha DESC')),
+        Index('idx_mov_deuda_fecha_brin', 'fecha', postgresql_using='brin', postgresql_with={'pages_per_range': 32}),
+    )
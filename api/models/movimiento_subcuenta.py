@@ -1,7 +1,8 @@
-from sqlalchemy import Column, BigInteger, String, Boolean, DateTime, Date, Numeric, Text, ForeignKey, CheckConstraint
+from sqlalchemy import Column, BigInteger, String, Boolean, DateTime, Date, Text, ForeignKey, CheckConstraint, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from api.database import Base
+from api.models.tipos import Dinero
 
 class MovimientoSubcuenta(Base):
     __tablename__ = "movimientos_subcuenta"
@@ -17,7 +18,7 @@ class MovimientoSubcuenta(Base):
     # Datos principales
     fecha = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     tipo = Column(String(30), nullable=False)  # 'TRANSFERENCIA', 'AJUSTE', etc.
-    monto = Column(Numeric(15, 2), nullable=False)
+    monto = Column(Dinero, nullable=False)
     descripcion = Column(Text, nullable=True)
 
     # Auditoría
@@ -42,4 +43,6 @@ class MovimientoSubcuenta(Base):
             "tipo = 'TRANSFERENCIA' AND subcuenta_destino_id IS NOT NULL OR tipo != 'TRANSFERENCIA' AND subcuenta_destino_id IS NULL",
             name='check_transferencia_tiene_destino'
         ),
+        # Índices (definidos en database/V017)
+        Index('idx_mov_subcuenta_fecha_brin', 'fecha', postgresql_using='brin', postgresql_with={'pages_per_range': 32}),
     )
\ No newline at end of file
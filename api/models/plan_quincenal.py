@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, BigInteger, String, Boolean, DateTime, Numeric, Text, ForeignKey, CheckConstraint
+from sqlalchemy import Column, Integer, BigInteger, String, Boolean, DateTime, Text, ForeignKey, CheckConstraint, FetchedValue
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from api.database import Base
+from api.models.tipos import Dinero, TipoMovimientoPlan
 
 class PlanQuincenal(Base):
     __tablename__ = 'plan_quincenal'
@@ -20,10 +21,10 @@ class PlanQuincenal(Base):
     # Datos principales
     nombre = Column(String(150), nullable=False)
     descripcion = Column(Text, nullable=True)
-    tipo_movimiento = Column(String(30), nullable=False)
+    tipo_movimiento = Column(TipoMovimientoPlan, nullable=False)
     
     # Monto
-    monto = Column(Numeric(15, 2), nullable=False)
+    monto = Column(Dinero, nullable=False)
     
     # Configuración
     activo = Column(Boolean, nullable=False, default=True, server_default='true')
@@ -33,7 +34,7 @@ class PlanQuincenal(Base):
     
     # Auditoria
     creado_en = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
-    actualizado_en = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+    actualizado_en = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), server_onupdate=FetchedValue())
     ejecutado_en = Column(DateTime(timezone=True), nullable=True)
     
     # Relaciones con otros modelos
@@ -46,10 +47,6 @@ class PlanQuincenal(Base):
     
     # Constraints
     __table_args__ = (
-        CheckConstraint(
-            "tipo_movimiento IN ('TRANSFERENCIA_CUENTAS', 'MOVIMIENTO_SUBCUENTA', 'PAGO_DEUDA', 'AHORRO')",
-            name='check_tipo_movimiento_valido'
-        ),
         CheckConstraint(
             "prioridad IN ('ALTA', 'MEDIA', 'BAJA')",
             name='check_prioridad_valida'
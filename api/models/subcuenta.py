@@ -1,9 +1,10 @@
-from sqlalchemy import Column, BigInteger, String, Boolean, DateTime, Integer, Text, ForeignKey, CheckConstraint, Numeric
+from sqlalchemy import Column, BigInteger, String, Boolean, DateTime, Integer, Text, ForeignKey, CheckConstraint, FetchedValue
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from api.database import Base
+from api.models.tipos import ColorHexMixin, Dinero
 
-class Subcuenta(Base):
+class Subcuenta(ColorHexMixin, Base):
     __tablename__ = "subcuentas"
 
     # Clave primaria
@@ -17,8 +18,8 @@ class Subcuenta(Base):
     descripcion = Column(Text, nullable=True)
 
     # Metas y saldos
-    monto_meta = Column(Numeric(15, 2), nullable=True)
-    saldo_actual = Column(Numeric(15, 2), nullable=False, default=0.00)
+    monto_meta = Column(Dinero, nullable=True)
+    saldo_actual = Column(Dinero, nullable=False, default=0.00)
 
     # Configuración
     activa = Column(Boolean, nullable=False, default=True)
@@ -28,7 +29,7 @@ class Subcuenta(Base):
 
     # Auditoría
     creada_en = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    actualizada_en = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    actualizada_en = Column(DateTime(timezone=True), server_default=func.now(), server_onupdate=FetchedValue(), nullable=False)
 
     # Relaciones
     cuenta = relationship("Cuenta", back_populates="subcuentas")
@@ -42,5 +43,5 @@ class Subcuenta(Base):
     __table_args__ = (
         CheckConstraint("LENGTH(TRIM(nombre)) > 0", name='check_nombre_no_vacio'),
         CheckConstraint("monto_meta IS NULL OR monto_meta > 0", name='check_monto_meta_positivo'),
-        CheckConstraint("color_hex ~ '^#[0-9A-Fa-f]{6}$'", name='check_color_hex_valido'),
+        CheckConstraint("es_color_hex(color_hex)", name='check_color_hex_valido'),
     )
\ No newline at end of file
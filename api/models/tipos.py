@@ -0,0 +1,59 @@
+from sqlalchemy import Numeric
+from sqlalchemy.dialects.postgresql import ENUM
+from sqlalchemy.orm import validates
+
+# Tipo de columna compartido para los montos de dinero: NUMERIC(15,2) en la
+# base de datos y Decimal en Python. Cualquier cambio de representación de los
+# montos se hace aquí y en una migración, no en cada modelo.
+Dinero = Numeric(15, 2)
+
+# Tipos ENUM de PostgreSQL para los campos categóricos (V015__tipos_enum.sql).
+# Los tipos los crea la migración, no SQLAlchemy (create_type=False).
+TipoCuenta = ENUM(
+    'EFECTIVO', 'CUENTA_CORRIENTE', 'CUENTA_AHORRO', 'CUENTA_NOMINA', 'TARJETA_CREDITO', 'TARJETA_DEBITO',
+    'INVERSION', 'PRESTAMO', 'WALLET_DIGITAL', 'CRIPTOMONEDA', 'OTRO',
+    name='tipo_cuenta_enum', create_type=False
+)
+TipoDeuda = ENUM(
+    'TARJETA', 'PRESTAMO', 'HIPOTECA', 'AUTO', 'POR_PAGAR', 'POR_COBRAR', 'OTRO',
+    name='tipo_deuda_enum', create_type=False
+)
+EstadoDeuda = ENUM(
+    'ACTIVA', 'PAGADA', 'VENCIDA', 'REFINANCIADA', 'CANCELADA',
+    name='estado_deuda_enum', create_type=False
+)
+TipoMovimientoDeuda = ENUM(
+    'CARGO', 'PAGO', 'AJUSTE', 'INTERES', 'REFINANCIACION',
+    name='tipo_movimiento_deuda_enum', create_type=False
+)
+EstadoGastoPlanificado = ENUM(
+    'PENDIENTE', 'EN_PROGRESO', 'COMPLETADO', 'CANCELADO', 'VENCIDO',
+    name='estado_gasto_planificado_enum', create_type=False
+)
+Prioridad = ENUM('ALTA', 'MEDIA', 'BAJA', name='prioridad_enum', create_type=False)
+TipoCompromiso = ENUM('INGRESO', 'EGRESO', name='tipo_compromiso_enum', create_type=False)
+FrecuenciaCompromiso = ENUM(
+    'DIARIA', 'SEMANAL', 'QUINCENAL', 'MENSUAL', 'BIMESTRAL', 'TRIMESTRAL', 'SEMESTRAL', 'ANUAL',
+    name='frecuencia_compromiso_enum', create_type=False
+)
+TipoMovimientoPlan = ENUM(
+    'TRANSFERENCIA_CUENTAS', 'MOVIMIENTO_SUBCUENTA', 'PAGO_DEUDA',
+    name='tipo_movimiento_plan_enum', create_type=False
+)
+
+def color_hex_normalizado(valor):
+    """Color en el formato que acepta check_color_hex_valido (#RRGGBB en mayúsculas)"""
+    return valor.upper() if valor else valor
+
+class ColorHexMixin:
+    """
+    Normaliza color_hex a mayúsculas al asignarlo.
+
+    La restricción check_color_hex_valido (es_color_hex) solo acepta #RRGGBB en mayúsculas,
+    lo que permite validar con una clase de caracteres simple.
+    Los INSERT de Core no pasan por @validates: usar color_hex_normalizado().
+    """
+
+    @validates('color_hex')
+    def normalizar_color_hex(self, key, valor):
+        return color_hex_normalizado(valor)
@@ -1,7 +1,8 @@
-from sqlalchemy import Column, BigInteger, String, Boolean, DateTime, Date, Numeric, Text, ForeignKey, CheckConstraint
+from sqlalchemy import Column, BigInteger, String, Boolean, DateTime, Date, Text, ForeignKey, CheckConstraint, FetchedValue, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from api.database import Base
+from api.models.tipos import Dinero
 
 class Transaccion(Base):
     __tablename__ = "transacciones"
@@ -19,13 +20,13 @@ class Transaccion(Base):
     # Datos principales
     fecha = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
     tipo = Column(String(20), nullable=False)  # 'INGRESO', 'GASTO', 'TRANSFERENCIA', 'AJUSTE'
-    monto = Column(Numeric(15, 2), nullable=False)
+    monto = Column(Dinero, nullable=False)
     descripcion = Column(Text, nullable=True)
     referencia = Column(String(100), nullable=True)
 
     # Auditoría
     creada_en = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    actualizada_en = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    actualizada_en = Column(DateTime(timezone=True), server_default=func.now(), server_onupdate=FetchedValue(), nullable=False)
     
     # ============ RELATIONSHIPS (para navegación ORM) ============
     # Relación con Usuario
@@ -42,8 +43,8 @@ class Transaccion(Base):
     compromiso_recurrente = relationship("CompromisoRecurrente", back_populates="transacciones")
     
     # Relación con Movimientos de Subcuentas
-    movimientos_subcuenta = relationship("MovimientoSubcuenta", back_populates="transaccion", lazy="dynamic")
-    movimientos_deuda = relationship("MovimientoDeuda", back_populates="transaccion", lazy="dynamic")
+    movimientos_subcuenta = relationship("MovimientoSubcuenta", back_populates="transaccion", passive_deletes="all")
+    movimientos_deuda = relationship("MovimientoDeuda", back_populates="transaccion", passive_deletes="all")
     
     # Relación con Plan Quincenal
     plan_quincenal = relationship("PlanQuincenal", foreign_keys="PlanQuincenal.transaccion_generada_id", back_populates="transaccion_generada")
@@ -70,4 +71,6 @@ class Transaccion(Base):
             "cuenta_origen_id IS NULL OR cuenta_destino_id IS NULL OR cuenta_origen_id != cuenta_destino_id",
             name='check_cuentas_diferentes'
         ),
+        # Índices (definidos en database/V004)
+        Index('idx_transacciones_usuario_fecha', 'usuario_id', fecha.desc()),
     )
\ No newline at end of file
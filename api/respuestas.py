@@ -0,0 +1,108 @@
+from decimal import Decimal
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy import Column, Row, Select, Table
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from typing import Any, AsyncIterator, List, Sequence, Type
+import orjson
+
+# Filas que se leen del cursor del servidor y se serializan en cada bloque
+FILAS_POR_LOTE_STREAMING = 50
+
+# timestamptz llega en UTC: Pydantic lo escribe con "Z", no con "+00:00"
+_OPCIONES_FILAS = orjson.OPT_UTC_Z
+
+def _serializar_por_defecto(valor: Any) -> Any:
+    """Tipos que orjson no serializa de forma nativa"""
+    if isinstance(valor, Decimal):
+        # Igual que Pydantic: los montos viajan como texto para no perder precisión
+        return str(valor)
+    raise TypeError
+
+class RespuestaORJSON(ORJSONResponse):
+    """Respuesta por defecto de la API, serializada con orjson"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            default=_serializar_por_defecto,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_NAIVE_UTC
+        )
+
+class RespuestaJSONSerializada(JSONResponse):
+    """
+    JSONResponse cuyo contenido ya viene serializado en bytes.
+
+    Hereda de JSONResponse para que fastapi-cache la reconozca y guarde
+    el cuerpo tal cual.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return content
+
+def columnas_respuesta(tabla: Table, esquema: Type[BaseModel]) -> List[Column]:
+    """
+    Columnas de la tabla que el esquema de respuesta necesita.
+
+    Los listados seleccionan solo estas columnas y reciben filas Core: no se
+    crean instancias ORM (identity map, eventos de atributos) que solo se
+    usarían para leerlas una vez, ni se traen columnas que no se devuelven.
+    """
+    return [tabla.c[nombre] for nombre in esquema.model_fields if nombre in tabla.c]
+
+def serializar_lista(adaptador: TypeAdapter, filas: Sequence[Any]) -> bytes:
+    """
+    Serializar una lista de filas (ORM o Core) con un TypeAdapter precompilado.
+
+    La validación (from_attributes) y el volcado a JSON se hacen en una
+    sola pasada del núcleo de Pydantic, sin construir cada modelo en Python.
+    """
+    datos = adaptador.validate_python(filas, from_attributes=True)
+    return adaptador.dump_json(datos)
+
+def respuesta_lista(adaptador: TypeAdapter, filas: Sequence[Any], status_code: int = 200) -> RespuestaJSONSerializada:
+    """Respuesta con la lista de filas ya serializada (ver serializar_lista)"""
+    return RespuestaJSONSerializada(serializar_lista(adaptador, filas), status_code=status_code)
+
+def serializar_filas(filas: Sequence[Row]) -> bytes:
+    """
+    Serializar filas Core leídas de la base de datos sin validarlas.
+
+    Las columnas (ver columnas_respuesta) ya tienen los tipos y restricciones
+    del esquema de respuesta, así que volver a validarlas solo cuesta tiempo.
+    La salida es la misma que la de Pydantic: mismo orden de campos, montos
+    como texto y fechas en ISO 8601 con "Z" para UTC.
+    """
+    return orjson.dumps(
+        [fila._asdict() for fila in filas],
+        default=_serializar_por_defecto,
+        option=_OPCIONES_FILAS
+    )
+
+def respuesta_filas(filas: Sequence[Row]) -> RespuestaJSONSerializada:
+    """Respuesta con las filas Core ya serializadas (ver serializar_filas)"""
+    return RespuestaJSONSerializada(serializar_filas(filas))
+
+def respuesta_ndjson(
+    sessionmaker: async_sessionmaker[AsyncSession],
+    consulta: Select,
+    adaptador: TypeAdapter
+) -> StreamingResponse:
+    """
+    Respuesta NDJSON (un objeto JSON por línea) leída con un cursor del servidor.
+
+    Las filas llegan en lotes de FILAS_POR_LOTE_STREAMING y cada lote se envía
+    en cuanto se serializa: la memoria por petición no depende del tamaño del
+    listado y el primer byte sale antes de leer la última fila.
+
+    La sesión se abre dentro del generador porque la de get_db se cierra antes
+    de que empiece a enviarse el cuerpo.
+    """
+    async def lineas() -> AsyncIterator[bytes]:
+        async with sessionmaker() as db:
+            resultado = await db.stream(consulta.execution_options(yield_per=FILAS_POR_LOTE_STREAMING))
+            async for lote in resultado.partitions():
+                modelos = adaptador.validate_python(lote, from_attributes=True)
+                yield b"".join(modelo.__pydantic_serializer__.to_json(modelo) + b"\n" for modelo in modelos)
+
+    return StreamingResponse(lineas(), media_type="application/x-ndjson")
@@ -1,32 +1,82 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
+from sqlalchemy import bindparam, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from api.cache import NAMESPACE_CATEGORIAS, invalidar_cache, version_namespace
 from api.database import get_db
 from api.models.categoria import Categoria
+from api.respuestas import RespuestaJSONSerializada, columnas_respuesta, serializar_filas
 from api.schemas.categoria import CategoriaCreate, CategoriaResponse, CategoriaUpdate
-from typing import List, Optional
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+import hashlib
 
 router = APIRouter(prefix="/categorias", tags=["categorias"])
 
+# Búsqueda por id construida una sola vez (ver QUERY_CACHE_SIZE en api/database.py)
+_CONSULTA_CATEGORIA_POR_ID = select(Categoria).where(Categoria.categoria_id == bindparam("categoria_id"))
+
+# Columnas que devuelve el listado (filas Core, sin instancias ORM)
+_COLUMNAS_LISTA_CATEGORIAS = columnas_respuesta(Categoria.__table__, CategoriaResponse)
+
+# Listas ya serializadas en memoria del proceso, por (versión, tipo_transaccion).
+# La versión vive en el backend de caché y cambia con cada invalidar_cache, así
+# que una escritura en cualquier proceso deja obsoletas las entradas de todos.
+MAX_LISTAS_EN_MEMORIA = 8
+_listas_categorias: "OrderedDict[Tuple[str, Optional[str]], bytes]" = OrderedDict()
+
+def _guardar_lista(clave: Tuple[str, Optional[str]], cuerpo: bytes):
+    _listas_categorias[clave] = cuerpo
+    if len(_listas_categorias) > MAX_LISTAS_EN_MEMORIA:
+        _listas_categorias.popitem(last=False)
+
+def _consulta_lista_categorias(tipo_transaccion: Optional[str]):
+    query = select(*_COLUMNAS_LISTA_CATEGORIAS)
+    if tipo_transaccion:
+        query = query.where(Categoria.tipo_transaccion == tipo_transaccion)
+    return query
+
 @router.get("/", response_model=List[CategoriaResponse])
 async def listar_categorias(
+    request: Request,
     tipo_transaccion: Optional[str] = Query(None, description="Filtrar por tipo de transacción (INGRESO, GASTO, TRANSFERENCIA, AJUSTE)"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Listar todas las categorías. Opcionalmente filtrar por tipo de transacción.
+
+    Responde con un ETag derivado de la versión de las categorías: si el
+    cliente envía el mismo valor en If-None-Match se responde 304 sin
+    consultar la base de datos.
     """
-    query = db.query(Categoria)
-    if tipo_transaccion:
-        query = query.filter(Categoria.tipo_transaccion == tipo_transaccion)
-    categorias = query.all()
-    return categorias
+    version = await version_namespace(NAMESPACE_CATEGORIAS)
+    if version is None:
+        # Sin backend de caché no hay versión fiable: consultar siempre
+        result = await db.execute(_consulta_lista_categorias(tipo_transaccion))
+        return RespuestaJSONSerializada(serializar_filas(result.all()))
+
+    encabezados = {
+        "ETag": f'"{hashlib.sha256(version.encode()).hexdigest()[:32]}"',
+        "Cache-Control": "no-cache"
+    }
+    if request.headers.get("if-none-match") == encabezados["ETag"]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=encabezados)
+
+    clave = (version, tipo_transaccion)
+    cuerpo = _listas_categorias.get(clave)
+    if cuerpo is None:
+        result = await db.execute(_consulta_lista_categorias(tipo_transaccion))
+        cuerpo = serializar_filas(result.all())
+        _guardar_lista(clave, cuerpo)
+    else:
+        _listas_categorias.move_to_end(clave)
+    return RespuestaJSONSerializada(cuerpo, headers=encabezados)
 
 @router.get("/{categoria_id}", response_model=CategoriaResponse)
-async def obtener_categoria(categoria_id: int, db: Session = Depends(get_db)):
+async def obtener_categoria(categoria_id: int, db: AsyncSession = Depends(get_db)):
     """
     Obtener una categoría específica por ID.
     """
-    categoria = db.query(Categoria).filter(Categoria.categoria_id == categoria_id).first()
+    categoria = await db.scalar(_CONSULTA_CATEGORIA_POR_ID, {"categoria_id": categoria_id})
     if not categoria:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -37,53 +87,54 @@ async def obtener_categoria(categoria_id: int, db: Session = Depends(get_db)):
 @router.post("/", response_model=CategoriaResponse, status_code=status.HTTP_201_CREATED)
 async def crear_categoria(
     nueva_categoria: CategoriaCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Crear una nueva categoría.
     """
     categoria = Categoria(**nueva_categoria.model_dump())
     db.add(categoria)
-    db.commit()
-    db.refresh(categoria)
+    await db.commit()
+    await invalidar_cache(NAMESPACE_CATEGORIAS)
     return categoria
 
 @router.put("/{categoria_id}", response_model=CategoriaResponse)
 async def actualizar_categoria(
     categoria_id: int,
     categoria_update: CategoriaUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Actualizar una categoría existente.
     """
-    categoria = db.query(Categoria).filter(Categoria.categoria_id == categoria_id).first()
+    categoria = await db.scalar(_CONSULTA_CATEGORIA_POR_ID, {"categoria_id": categoria_id})
     if not categoria:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Categoría no encontrada"
         )
     
-    datos_actualizados = categoria_update.model_dump(exclude_unset=True)
-    for campo, valor in datos_actualizados.items():
-        setattr(categoria, campo, valor)
+    # model_fields_set ya tiene los campos enviados: sin model_dump intermedio
+    for campo in categoria_update.model_fields_set:
+        setattr(categoria, campo, getattr(categoria_update, campo))
     
-    db.commit()
-    db.refresh(categoria)
+    await db.commit()
+    await invalidar_cache(NAMESPACE_CATEGORIAS)
     return categoria
 
 @router.delete("/{categoria_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def eliminar_categoria(categoria_id: int, db: Session = Depends(get_db)):
+async def eliminar_categoria(categoria_id: int, db: AsyncSession = Depends(get_db)):
     """
     Eliminar una categoría por ID.
     """
-    categoria = db.query(Categoria).filter(Categoria.categoria_id == categoria_id).first()
+    categoria = await db.scalar(_CONSULTA_CATEGORIA_POR_ID, {"categoria_id": categoria_id})
     if not categoria:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Categoría no encontrada"
         )
     
-    db.delete(categoria)
-    db.commit()
+    await db.delete(categoria)
+    await db.commit()
+    await invalidar_cache(NAMESPACE_CATEGORIAS)
     return
\ No newline at end of file
@@ -1,19 +1,47 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from api.database import get_db
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from fastapi_cache.decorator import cache
+from api.cache import EXPIRACION_CORTA, NAMESPACE_CATEGORIAS, NAMESPACE_CUENTAS, CoderRespuestaSerializada, invalidar_cache
+from api.database import get_db, restriccion_violada
 from api.models.cuenta import Cuenta
 from api.models.usuario import Usuario
 from api.models.transaccion import Transaccion
-from api.models.categoria import Categoria
-from api.schemas.cuenta import CuentaCreate, CuentaResponse, CuentaUpdate
+from api.models.moneda import Moneda
+from api.models.tipos import TipoCuenta, color_hex_normalizado
+from api.respuestas import RespuestaORJSON, columnas_respuesta, respuesta_filas
+from api.schemas.cuenta import CuentaCreate, CuentaDetalleResponse, CuentaResponse, CuentaUpdate
+from api.services.categoria_ajuste import obtener_categoria_ajuste
 from typing import List
 from datetime import datetime
 from decimal import Decimal
 
 router = APIRouter(prefix="/cuentas", tags=["cuentas"])
 
+# Búsqueda por id construida una sola vez (ver QUERY_CACHE_SIZE en api/database.py)
+_CONSULTA_CUENTA_POR_ID = select(Cuenta).where(Cuenta.cuenta_id == bindparam("cuenta_id"))
+
+# Columnas que devuelve el listado (filas Core, sin instancias ORM)
+_COLUMNAS_LISTA_CUENTAS = columnas_respuesta(Cuenta.__table__, CuentaResponse)
+
+def consulta_cuenta_con_relaciones():
+    """
+    SELECT de cuentas con sus colecciones cargadas por selectinload.
+
+    Cada colección se resuelve con un único SELECT ... WHERE cuenta_id IN (...)
+    en lugar de una consulta por cuenta y relación.
+    """
+    return select(Cuenta).options(
+        selectinload(Cuenta.subcuentas),
+        selectinload(Cuenta.deudas),
+        selectinload(Cuenta.compromisos_recurrentes)
+    )
+
 @router.post("/", response_model=CuentaResponse, status_code=status.HTTP_201_CREATED)
-async def crear_cuenta(cuenta: CuentaCreate, db: Session = Depends(get_db)):
+async def crear_cuenta(cuenta: CuentaCreate, db: AsyncSession = Depends(get_db)):
     """
     Crear una nueva cuenta financiera.
     
@@ -28,78 +56,70 @@ async def crear_cuenta(cuenta: CuentaCreate, db: Session = Depends(get_db)):
     se debe crear una transacción de tipo AJUSTE_INICIAL después de crear la cuenta.
     """
     # Verificar que el usuario existe
-    usuario = db.query(Usuario).filter(Usuario.usuario_id == cuenta.usuario_id).first()
+    usuario = await db.scalar(select(Usuario).where(Usuario.usuario_id == cuenta.usuario_id))
     if not usuario:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Usuario no encontrado"
         )
     
-    # Verificar que no exista otra cuenta con el mismo nombre para el mismo usuario
-    cuenta_existente = db.query(Cuenta).filter(
-        Cuenta.usuario_id == cuenta.usuario_id,
-        Cuenta.nombre == cuenta.nombre
-    ).first()
-    
-    if cuenta_existente:
+    # Verificar que la moneda está en el catálogo
+    if not await db.scalar(select(Moneda.codigo).where(Moneda.codigo == cuenta.moneda)):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Ya existe una cuenta con ese nombre para este usuario"
+            detail="Moneda no soportada"
         )
     
-    # Crear la nueva cuenta (excluir saldo_inicial ya que no está en el modelo)
+    # Crear la nueva cuenta (excluir saldo_inicial ya que no está en el modelo).
+    # El índice único (usuario_id, nombre) decide si ya existe: ON CONFLICT DO NOTHING
+    # no devuelve fila en ese caso (sin SELECT previo ni carrera)
     datos_cuenta = cuenta.model_dump(exclude={'saldo_inicial'})
-    nueva_cuenta = Cuenta(**datos_cuenta)
-    
-    db.add(nueva_cuenta)
-    db.commit()
-    db.refresh(nueva_cuenta)
+    datos_cuenta['color_hex'] = color_hex_normalizado(datos_cuenta['color_hex'])
+    nueva_cuenta = await db.scalar(
+        insert(Cuenta).values(**datos_cuenta).on_conflict_do_nothing().returning(Cuenta)
+    )
+    if nueva_cuenta is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Ya existe una cuenta con ese nombre para este usuario"
+        )
     
-    # Si hay saldo inicial, crear transacción de AJUSTE
+    # Si hay saldo inicial, crear transacción de AJUSTE en la misma transacción
+    categoria_creada = False
     if cuenta.saldo_inicial and cuenta.saldo_inicial > 0:
-        # Buscar o crear categoría para ajustes iniciales
-        categoria_ajuste = db.query(Categoria).filter(
-            Categoria.nombre == "Ajuste Inicial",
-            Categoria.tipo_transaccion == "AJUSTE"
-        ).first()
+        categoria_id, categoria_creada = await obtener_categoria_ajuste(db)
         
-        if not categoria_ajuste:
-            categoria_ajuste = Categoria(
-                nombre="Ajuste Inicial",
-                tipo_transaccion="AJUSTE",
-                descripcion="Categoría para ajustes de saldo inicial",
-                activa=True
-            )
-            db.add(categoria_ajuste)
-            db.commit()
-            db.refresh(categoria_ajuste)
-        
-        # Crear transacción de ajuste
-        transaccion_ajuste = Transaccion(
+        db.add(Transaccion(
             usuario_id=cuenta.usuario_id,
             cuenta_destino_id=nueva_cuenta.cuenta_id,
-            categoria_id=categoria_ajuste.categoria_id,
+            categoria_id=categoria_id,
             fecha=datetime.now(),
             tipo="AJUSTE",
-            monto=Decimal(str(cuenta.saldo_inicial)),
+            monto=cuenta.saldo_inicial,
             descripcion=f"Saldo inicial de cuenta: {nueva_cuenta.nombre}",
             referencia="AJUSTE_INICIAL"
-        )
-        
-        db.add(transaccion_ajuste)
-        db.commit()
-        db.refresh(nueva_cuenta)
+        ))
     
+    await db.commit()
+    
+    if cuenta.saldo_inicial and cuenta.saldo_inicial > 0:
+        # El trigger de transacciones actualizó saldo_actual en la base de datos
+        await db.refresh(nueva_cuenta, attribute_names=['saldo_actual', 'actualizada_en'])
+    
+    if categoria_creada:
+        await invalidar_cache(NAMESPACE_CATEGORIAS)
+    await invalidar_cache(NAMESPACE_CUENTAS)
     return nueva_cuenta
 
 @router.get("/", response_model=List[CuentaResponse])
+@cache(expire=EXPIRACION_CORTA, namespace=NAMESPACE_CUENTAS, coder=CoderRespuestaSerializada)
 async def obtener_cuentas(
     skip: int = Query(0, ge=0, description="Número de registros a omitir"),
     limit: int = Query(100, ge=1, le=1000, description="Número máximo de registros"),
     usuario_id: int = Query(None, description="Filtrar por usuario"),
     activa: bool = Query(None, description="Filtrar por estado activo"),
     tipo_cuenta: str = Query(None, description="Filtrar por tipo de cuenta"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Obtener todas las cuentas con filtros opcionales.
@@ -111,26 +131,47 @@ async def obtener_cuentas(
     - **activa**: Filtrar por estado (true/false)
     - **tipo_cuenta**: Filtrar por tipo de cuenta
     """
-    query = db.query(Cuenta)
+    query = select(*_COLUMNAS_LISTA_CUENTAS)
     
     if usuario_id is not None:
-        query = query.filter(Cuenta.usuario_id == usuario_id)
+        query = query.where(Cuenta.usuario_id == usuario_id)
     
     if activa is not None:
-        query = query.filter(Cuenta.activa == activa)
+        query = query.where(Cuenta.activa == activa)
     
     if tipo_cuenta is not None:
-        query = query.filter(Cuenta.tipo_cuenta == tipo_cuenta)
+        # La columna es un ENUM: un valor fuera de la lista fallaría en la base de datos
+        if tipo_cuenta not in TipoCuenta.enums:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Tipo de cuenta inválido. Debe ser uno de: {', '.join(sorted(TipoCuenta.enums))}"
+            )
+        query = query.where(Cuenta.tipo_cuenta == tipo_cuenta)
     
-    cuentas = query.order_by(Cuenta.orden_mostrar, Cuenta.nombre).offset(skip).limit(limit).all()
-    return cuentas
+    result = await db.execute(query.order_by(Cuenta.orden_mostrar, Cuenta.nombre).offset(skip).limit(limit))
+    cuentas = result.all()
+    # Se serializa aquí para que la respuesta se pueda guardar en caché
+    return respuesta_filas(cuentas)
 
 @router.get("/{cuenta_id}", response_model=CuentaResponse)
-async def obtener_cuenta(cuenta_id: int, db: Session = Depends(get_db)):
+async def obtener_cuenta(cuenta_id: int, db: AsyncSession = Depends(get_db)):
     """
     Obtener una cuenta específica por ID.
     """
-    cuenta = db.query(Cuenta).filter(Cuenta.cuenta_id == cuenta_id).first()
+    cuenta = await db.scalar(_CONSULTA_CUENTA_POR_ID, {"cuenta_id": cuenta_id})
+    if not cuenta:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Cuenta no encontrada"
+        )
+    return cuenta
+
+@router.get("/{cuenta_id}/detalle", response_model=CuentaDetalleResponse)
+async def obtener_cuenta_detalle(cuenta_id: int, db: AsyncSession = Depends(get_db)):
+    """
+    Obtener una cuenta con sus subcuentas, deudas y compromisos recurrentes.
+    """
+    cuenta = await db.scalar(consulta_cuenta_con_relaciones().where(Cuenta.cuenta_id == cuenta_id))
     if not cuenta:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -142,104 +183,131 @@ async def obtener_cuenta(cuenta_id: int, db: Session = Depends(get_db)):
 async def actualizar_cuenta(
     cuenta_id: int,
     cuenta_actualizada: CuentaUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Actualizar una cuenta existente.
     
     Solo se actualizarán los campos proporcionados.
     """
-    cuenta = db.query(Cuenta).filter(Cuenta.cuenta_id == cuenta_id).first()
-    if not cuenta:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Cuenta no encontrada"
-        )
-    
     # Actualizar solo los campos proporcionados
-    datos_actualizados = cuenta_actualizada.model_dump(exclude_unset=True)
-    
-    # Verificar unicidad del nombre si se está actualizando
-    if 'nombre' in datos_actualizados:
-        cuenta_con_mismo_nombre = db.query(Cuenta).filter(
-            Cuenta.usuario_id == cuenta.usuario_id,
-            Cuenta.nombre == datos_actualizados['nombre'],
-            Cuenta.cuenta_id != cuenta_id
-        ).first()
-        
-        if cuenta_con_mismo_nombre:
+    datos_actualizados = {campo: getattr(cuenta_actualizada, campo) for campo in cuenta_actualizada.model_fields_set}
+    if not datos_actualizados:
+        cuenta = await db.scalar(_CONSULTA_CUENTA_POR_ID, {"cuenta_id": cuenta_id})
+        if not cuenta:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Cuenta no encontrada"
+            )
+        return cuenta
+    
+    if datos_actualizados.get('color_hex'):
+        datos_actualizados['color_hex'] = color_hex_normalizado(datos_actualizados['color_hex'])
+    
+    # Un solo UPDATE ... RETURNING: la existencia la decide el WHERE y la
+    # unicidad del nombre y la moneda las validan idx_cuentas_nombre_usuario_unico
+    # y fk_cuenta_moneda en la misma sentencia (sin SELECT previos ni carreras)
+    try:
+        cuenta = await db.scalar(
+            update(Cuenta)
+            .where(Cuenta.cuenta_id == cuenta_id)
+            .values(**datos_actualizados)
+            .returning(Cuenta)
+            .execution_options(synchronize_session=False)
+        )
+    except IntegrityError as error:
+        await db.rollback()
+        restriccion = restriccion_violada(error)
+        if restriccion == 'idx_cuentas_nombre_usuario_unico':
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Ya existe otra cuenta con ese nombre para este usuario"
             )
+        if restriccion == 'fk_cuenta_moneda':
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Moneda no soportada"
+            )
+        raise
     
-    for campo, valor in datos_actualizados.items():
-        setattr(cuenta, campo, valor)
+    if cuenta is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Cuenta no encontrada"
+        )
     
-    db.commit()
-    db.refresh(cuenta)
+    await db.commit()
+    await invalidar_cache(NAMESPACE_CUENTAS)
     
     return cuenta
 
 @router.delete("/{cuenta_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def eliminar_cuenta(cuenta_id: int, db: Session = Depends(get_db)):
+async def eliminar_cuenta(cuenta_id: int, db: AsyncSession = Depends(get_db)):
     """
     Eliminar una cuenta.
     
     Nota: Esto eliminará la cuenta y todos sus datos relacionados en cascada.
     """
-    cuenta = db.query(Cuenta).filter(Cuenta.cuenta_id == cuenta_id).first()
+    cuenta = await db.scalar(_CONSULTA_CUENTA_POR_ID, {"cuenta_id": cuenta_id})
     if not cuenta:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Cuenta no encontrada"
         )
     
-    db.delete(cuenta)
-    db.commit()
+    await db.delete(cuenta)
+    await db.commit()
+    await invalidar_cache(NAMESPACE_CUENTAS)
     
     return None
 
 @router.get("/usuario/{usuario_id}/resumen")
-async def obtener_resumen_cuentas(usuario_id: int, db: Session = Depends(get_db)):
+async def obtener_resumen_cuentas(usuario_id: int, db: AsyncSession = Depends(get_db)):
     """
     Obtener un resumen de todas las cuentas de un usuario.
     
     Retorna el saldo total, cantidad de cuentas activas y desglose por tipo.
     """
     # Verificar que el usuario existe
-    usuario = db.query(Usuario).filter(Usuario.usuario_id == usuario_id).first()
-    if not usuario:
+    moneda = await db.scalar(select(Usuario.moneda_principal).where(Usuario.usuario_id == usuario_id))
+    if not moneda:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Usuario no encontrado"
         )
     
-    cuentas = db.query(Cuenta).filter(Cuenta.usuario_id == usuario_id).all()
-    
-    total_saldo = sum(
-        float(c.saldo_actual) for c in cuentas 
-        if c.activa and c.incluir_en_total
+    # Agregados por tipo calculados en la base de datos: una fila por tipo de cuenta
+    activa = Cuenta.activa.is_(True)
+    result = await db.execute(
+        select(
+            Cuenta.tipo_cuenta,
+            func.count().label("total"),
+            func.count().filter(activa).label("activas"),
+            func.coalesce(func.sum(Cuenta.saldo_actual).filter(activa), 0).label("saldo_activas"),
+            func.coalesce(func.sum(Cuenta.saldo_actual).filter(activa, Cuenta.incluir_en_total.is_(True)), 0).label("saldo_en_total")
+        )
+        .where(Cuenta.usuario_id == usuario_id)
+        .group_by(Cuenta.tipo_cuenta)
     )
+    filas = result.all()
     
-    cuentas_activas = sum(1 for c in cuentas if c.activa)
-    
-    por_tipo = {}
-    for cuenta in cuentas:
-        if cuenta.activa:
-            if cuenta.tipo_cuenta not in por_tipo:
-                por_tipo[cuenta.tipo_cuenta] = {
-                    "cantidad": 0,
-                    "saldo_total": 0
-                }
-            por_tipo[cuenta.tipo_cuenta]["cantidad"] += 1
-            por_tipo[cuenta.tipo_cuenta]["saldo_total"] += float(cuenta.saldo_actual)
+    # Se responde con RespuestaORJSON directamente: sin response_model, FastAPI
+    # pasaría el dict por jsonable_encoder, que recorre todo el contenido y
+    # convierte los Decimal en float. orjson los emite como texto, igual que
+    # saldo_actual en CuentaResponse.
+    por_tipo = {
+        fila.tipo_cuenta: {
+            "cantidad": fila.activas,
+            "saldo_total": fila.saldo_activas
+        }
+        for fila in filas if fila.activas
+    }
     
-    return {
+    return RespuestaORJSON({
         "usuario_id": usuario_id,
-        "total_cuentas": len(cuentas),
-        "cuentas_activas": cuentas_activas,
-        "saldo_total": total_saldo,
-        "moneda": usuario.moneda_principal,
+        "total_cuentas": sum(fila.total for fila in filas),
+        "cuentas_activas": sum(fila.activas for fila in filas),
+        "saldo_total": sum((fila.saldo_en_total for fila in filas), Decimal('0.00')),
+        "moneda": moneda,
         "desglose_por_tipo": por_tipo
-    }
+    })
@@ -1,19 +1,50 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from api.database import get_db
+from sqlalchemy import bindparam, insert, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from api.cache import NAMESPACE_CUENTAS, invalidar_cache
+from api.database import get_db, restriccion_violada
+from api.models.cuenta import Cuenta
 from api.models.transaccion import Transaccion
-from api.schemas.transaccion import TransaccionCreate, TransaccionUpdate, TransaccionResponse
+from api.models.usuario import Usuario
+from api.respuestas import columnas_respuesta, respuesta_filas, respuesta_lista
+from api.schemas.transaccion import ADAPTADOR_LISTA_TRANSACCIONES, TransaccionCreate, TransaccionUpdate, TransaccionResponse
+from itertools import islice
 from typing import List, Optional
 
 router = APIRouter(prefix="/transacciones", tags=["transacciones"])
 
+# Búsqueda por id construida una sola vez (ver QUERY_CACHE_SIZE en api/database.py)
+_CONSULTA_TRANSACCION_POR_ID = select(Transaccion).where(Transaccion.transaccion_id == bindparam("transaccion_id"))
+
+# Columnas que devuelve el listado (filas Core, sin instancias ORM)
+_COLUMNAS_LISTA_TRANSACCIONES = columnas_respuesta(Transaccion.__table__, TransaccionResponse)
+
+# Filas por sentencia INSERT en la creación masiva
+TAMANO_LOTE_BULK = 1000
+
+# Máximo de transacciones aceptadas en una sola petición masiva
+MAX_TRANSACCIONES_BULK = 10000
+
+# Restricciones de transacciones que una actualización parcial o una fila de
+# la creación masiva pueden violar (ver V004__transacciones.sql)
+_MENSAJES_RESTRICCIONES = {
+    'check_al_menos_una_cuenta': "Al menos una de 'cuenta_origen_id' o 'cuenta_destino_id' debe ser proporcionada.",
+    'check_logica_transferencia': "Las transferencias requieren 'cuenta_origen_id' y 'cuenta_destino_id'.",
+    'check_cuentas_diferentes': "Las cuentas de origen y destino deben ser diferentes.",
+    'fk_transaccion_cuenta_origen': "Cuenta de origen no encontrada",
+    'fk_transaccion_cuenta_destino': "Cuenta de destino no encontrada",
+    'fk_transaccion_categoria': "Categoría no encontrada",
+    'fk_transaccion_compromiso_recurrente': "Compromiso recurrente no encontrado",
+}
+
 @router.get("/", response_model=List[TransaccionResponse])
-def obtener_transacciones(
+async def obtener_transacciones(
     skip: int = Query(0, ge=0, description="Número de registros a omitir"),
     limit: int = Query(10, ge=1, le=300, description="Número máximo de registros a retornar"),
     usuario_id: Optional[int] = Query(None, description="Filtrar por ID de usuario"),
     cuenta_id: Optional[int] = Query(None, description="Filtrar por ID de cuenta"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Obtener todas las transacciones con filtros opcionales.
@@ -24,23 +55,28 @@ def obtener_transacciones(
     - **usuario_id**: Filtrar por ID de usuario
     - **cuenta_id**: Filtrar por ID de cuenta
     """
-    query = db.query(Transaccion)
+    query = select(*_COLUMNAS_LISTA_TRANSACCIONES)
 
     if usuario_id is not None:
-        query = query.filter(Transaccion.usuario_id == usuario_id)
+        query = query.where(Transaccion.usuario_id == usuario_id)
 
     if cuenta_id is not None:
-        query = query.filter(Transaccion.cuenta_id == cuenta_id)
+        # La cuenta puede estar en cualquiera de los dos lados de la transacción
+        query = query.where(or_(
+            Transaccion.cuenta_origen_id == cuenta_id,
+            Transaccion.cuenta_destino_id == cuenta_id
+        ))
     
-    transacciones = query.order_by(Transaccion.fecha.desc()).offset(skip).limit(limit).all()
-    return transacciones
+    result = await db.execute(query.order_by(Transaccion.fecha.desc()).offset(skip).limit(limit))
+    transacciones = result.all()
+    return respuesta_filas(transacciones)
 
 @router.get("/{transaccion_id}", response_model=TransaccionResponse)
-def obtener_transaccion(transaccion_id: int, db: Session = Depends(get_db)):
+async def obtener_transaccion(transaccion_id: int, db: AsyncSession = Depends(get_db)):
     """
     Obtener una transacción específica por ID.
     """
-    transaccion = db.query(Transaccion).filter(Transaccion.transaccion_id == transaccion_id).first()
+    transaccion = await db.scalar(_CONSULTA_TRANSACCION_POR_ID, {"transaccion_id": transaccion_id})
     if not transaccion:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -49,53 +85,125 @@ def obtener_transaccion(transaccion_id: int, db: Session = Depends(get_db)):
     return transaccion
 
 @router.post("/", response_model=TransaccionResponse, status_code=status.HTTP_201_CREATED)
-def crear_transaccion(transaccion: TransaccionCreate, db: Session = Depends(get_db)):
+async def crear_transaccion(transaccion: TransaccionCreate, db: AsyncSession = Depends(get_db)):
     """
     Crear una nueva transacción.
     """
     nueva_transaccion = Transaccion(**transaccion.model_dump())
     db.add(nueva_transaccion)
-    db.commit()
-    db.refresh(nueva_transaccion)
+    await db.commit()
+    # Los triggers actualizan el saldo de las cuentas afectadas
+    await invalidar_cache(NAMESPACE_CUENTAS)
 
     return nueva_transaccion
 
+@router.post("/bulk", response_model=List[TransaccionResponse], status_code=status.HTTP_201_CREATED)
+async def crear_transacciones_bulk(transacciones: List[TransaccionCreate], db: AsyncSession = Depends(get_db)):
+    """
+    Crear varias transacciones en una sola petición (importaciones, extractos bancarios).
+
+    Todas se insertan en la misma transacción de base de datos, en lotes de
+    hasta 1000 filas por INSERT. Si alguna referencia no existe o alguna fila
+    viola una restricción no se crea ninguna.
+    """
+    if not transacciones:
+        return []
+    if len(transacciones) > MAX_TRANSACCIONES_BULK:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Se permiten como máximo {MAX_TRANSACCIONES_BULK} transacciones por petición"
+        )
+
+    # Validar las claves foráneas con una consulta por tabla (WHERE id IN (...))
+    usuario_ids = {t.usuario_id for t in transacciones}
+    usuarios_existentes = set(await db.scalars(select(Usuario.usuario_id).where(Usuario.usuario_id.in_(usuario_ids))))
+    if usuarios_faltantes := usuario_ids - usuarios_existentes:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Usuarios no encontrados: {sorted(usuarios_faltantes)}"
+        )
+
+    cuenta_ids = {c for t in transacciones for c in (t.cuenta_origen_id, t.cuenta_destino_id) if c is not None}
+    cuentas_existentes = set(await db.scalars(select(Cuenta.cuenta_id).where(Cuenta.cuenta_id.in_(cuenta_ids))))
+    if cuentas_faltantes := cuenta_ids - cuentas_existentes:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Cuentas no encontradas: {sorted(cuentas_faltantes)}"
+        )
+
+    # INSERT multi-fila por lote; RETURNING devuelve las filas en el orden recibido.
+    # Categorías y compromisos no se validan arriba: la FK o el CHECK que falle
+    # se traduce a un 400 y se deshace todo lo insertado.
+    filas = (t.model_dump() for t in transacciones)
+    creadas = []
+    try:
+        while lote := list(islice(filas, TAMANO_LOTE_BULK)):
+            result = await db.scalars(
+                insert(Transaccion).returning(Transaccion, sort_by_parameter_order=True),
+                lote
+            )
+            creadas.extend(result.all())
+
+        await db.commit()
+    except IntegrityError as error:
+        await db.rollback()
+        mensaje = _MENSAJES_RESTRICCIONES.get(restriccion_violada(error))
+        if mensaje is not None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=mensaje
+            )
+        raise
+    # Los triggers actualizan el saldo de las cuentas afectadas
+    await invalidar_cache(NAMESPACE_CUENTAS)
+
+    return respuesta_lista(ADAPTADOR_LISTA_TRANSACCIONES, creadas, status_code=status.HTTP_201_CREATED)
+
 @router.put("/{transaccion_id}", response_model=TransaccionResponse)
-def actualizar_transaccion(transaccion_id: int, transaccion_update: TransaccionUpdate, db: Session = Depends(get_db)):
+async def actualizar_transaccion(transaccion_id: int, transaccion_update: TransaccionUpdate, db: AsyncSession = Depends(get_db)):
     """
     Actualizar una transacción existente.
     Solo se actualizarán los campos proporcionados.
     """
-    transaccion_db = db.query(Transaccion).filter(Transaccion.transaccion_id == transaccion_id).first()
+    transaccion_db = await db.scalar(_CONSULTA_TRANSACCION_POR_ID, {"transaccion_id": transaccion_id})
     if not transaccion_db:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Transacción no encontrada"
         )
     
-    datos_actualizados = transaccion_update.model_dump(exclude_unset=True)
-    
-    for campo, valor in datos_actualizados.items():
-        setattr(transaccion_db, campo, valor)
+    for campo in transaccion_update.model_fields_set:
+        setattr(transaccion_db, campo, getattr(transaccion_update, campo))
 
-    db.commit()
-    db.refresh(transaccion_db)
+    try:
+        await db.commit()
+    except IntegrityError as error:
+        await db.rollback()
+        mensaje = _MENSAJES_RESTRICCIONES.get(restriccion_violada(error))
+        if mensaje is not None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=mensaje
+            )
+        raise
+    await invalidar_cache(NAMESPACE_CUENTAS)
 
     return transaccion_db
 
 @router.delete("/{transaccion_id}", status_code=status.HTTP_204_NO_CONTENT)
-def eliminar_transaccion(transaccion_id: int, db: Session = Depends(get_db)):
+async def eliminar_transaccion(transaccion_id: int, db: AsyncSession = Depends(get_db)):
     """
     Eliminar una transacción por ID.
     """
-    transaccion = db.query(Transaccion).filter(Transaccion.transaccion_id == transaccion_id).first()
+    transaccion = await db.scalar(_CONSULTA_TRANSACCION_POR_ID, {"transaccion_id": transaccion_id})
     if not transaccion:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Transacción no encontrada"
         )
     
-    db.delete(transaccion)
-    db.commit()
+    await db.delete(transaccion)
+    await db.commit()
+    await invalidar_cache(NAMESPACE_CUENTAS)
 
     return
\ No newline at end of file
@@ -1,65 +1,205 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from api.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from sqlalchemy import bindparam, delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from api.cache import NAMESPACE_CUENTAS, invalidar_cache
+from api.database import get_db, restriccion_violada
+from api.models.moneda import Moneda
 from api.models.usuario import Usuario
-from api.schemas.usuario import UsuarioCreate, UsuarioUpdate, UsuarioResponse
-from typing import List
+from api.respuestas import columnas_respuesta, respuesta_filas, respuesta_ndjson
+from api.schemas.usuario import ADAPTADOR_LISTA_USUARIOS, UsuarioCreate, UsuarioUpdate, UsuarioResponse
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerifyMismatchError
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+import asyncio
 import bcrypt
+import hashlib
+import hmac
+import logging
+import os
+import secrets
+import time
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/usuarios", tags=["usuarios"])
 
-def hash_password(password: str) -> str:
-    """Hash de contraseña usando bcrypt"""
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+# Búsqueda por id construida una sola vez (ver QUERY_CACHE_SIZE en api/database.py)
+_CONSULTA_USUARIO_POR_ID = select(Usuario).where(Usuario.usuario_id == bindparam("usuario_id"))
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verificar contraseña"""
-    return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
+# Restricciones que garantizan un email único (V001__usuarios.sql)
+_RESTRICCIONES_EMAIL = frozenset({'usuarios_email_key', 'idx_usuarios_email_lower'})
 
-@router.post("/", response_model=UsuarioResponse, status_code=status.HTTP_201_CREATED)
-async def crear_usuario(usuario: UsuarioCreate, db: Session = Depends(get_db)):
+# Columnas que devuelve el listado: password_hash nunca sale de la base de datos
+_COLUMNAS_LISTA_USUARIOS = columnas_respuesta(Usuario.__table__, UsuarioResponse)
+
+# Argon2id para las contraseñas nuevas; los hashes bcrypt existentes se siguen verificando
+_hasher = PasswordHasher(
+    time_cost=int(os.getenv("ARGON2_TIME_COST", "2")),
+    memory_cost=int(os.getenv("ARGON2_MEMORY_COST", str(64 * 1024))),  # KiB
+    parallelism=int(os.getenv("ARGON2_PARALLELISM", "2"))
+)
+logger.info(
+    "Contraseñas: Argon2id (time_cost=%d, memory_cost=%d KiB, parallelism=%d); bcrypt %s para hashes anteriores",
+    _hasher.time_cost, _hasher.memory_cost, _hasher.parallelism, bcrypt.__version__
+)
+
+# El hash consume CPU durante decenas de milisegundos y libera el GIL:
+# se ejecuta en hilos para no bloquear el event loop
+_ejecutor_hash = ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix="password-hash")
+
+def _verify_password(plain_password: str, hashed_password: str) -> bool:
+    if hashed_password.startswith("$2"):
+        # Hash bcrypt anterior a Argon2
+        return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
+    try:
+        return _hasher.verify(hashed_password, plain_password)
+    except (VerifyMismatchError, InvalidHashError):
+        return False
+
+async def hash_password(password: str) -> str:
+    """Hash de contraseña usando Argon2id, fuera del event loop"""
+    return await asyncio.get_running_loop().run_in_executor(_ejecutor_hash, _hasher.hash, password)
+
+# Verificaciones correctas recientes, para no repetir el hash cuando el mismo
+# cliente se autentica varias veces seguidas. Solo se guardan los aciertos (un
+# intento fallido siempre paga el hash completo) y la clave es un HMAC con una
+# pimienta aleatoria del proceso: ni la contraseña ni un digest reutilizable
+# quedan en memoria. Incluye el hash guardado, así que cambiar la contraseña
+# invalida la entrada.
+MAX_VERIFICACIONES_EN_MEMORIA = int(os.getenv("PASSWORD_VERIFY_CACHE_SIZE", "10000"))
+EXPIRACION_VERIFICACION = float(os.getenv("PASSWORD_VERIFY_CACHE_TTL", "60"))  # segundos
+_pimienta_verificaciones = secrets.token_bytes(32)
+_verificaciones: "OrderedDict[bytes, float]" = OrderedDict()
+
+def _clave_verificacion(plain_password: str, hashed_password: str) -> bytes:
+    mensaje = plain_password.encode('utf-8') + b"\0" + hashed_password.encode('utf-8')
+    return hmac.new(_pimienta_verificaciones, mensaje, hashlib.sha256).digest()
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verificar contraseña (Argon2id o bcrypt), fuera del event loop"""
+    clave = _clave_verificacion(plain_password, hashed_password)
+    expira = _verificaciones.get(clave)
+    if expira is not None:
+        if expira > time.monotonic():
+            _verificaciones.move_to_end(clave)
+            return True
+        del _verificaciones[clave]
+    
+    valida = await asyncio.get_running_loop().run_in_executor(_ejecutor_hash, _verify_password, plain_password, hashed_password)
+    if valida and MAX_VERIFICACIONES_EN_MEMORIA > 0:
+        _verificaciones[clave] = time.monotonic() + EXPIRACION_VERIFICACION
+        if len(_verificaciones) > MAX_VERIFICACIONES_EN_MEMORIA:
+            _verificaciones.popitem(last=False)
+    return valida
+
+async def _validar_antes_del_hash(
+    db: AsyncSession,
+    moneda: Optional[str],
+    email: Optional[str],
+    usuario_id: Optional[int] = None
+):
     """
-    Crear un nuevo usuario
+    Comprobar en una sola consulta lo que rechazaría la escritura del usuario.
+
+    El hash Argon2id reserva decenas de MiB y ocupa un hilo del ejecutor: se
+    calcula solo después de esta consulta, así una petición inválida no lo
+    paga. Los índices únicos y fk_usuario_moneda siguen decidiendo en caso de
+    carrera entre esta consulta y el INSERT/UPDATE.
     """
-    # Verificar si el email ya existe
-    db_usuario = db.query(Usuario).filter(Usuario.email == usuario.email).first()
-    if db_usuario:
+    comprobaciones = {}
+    if usuario_id is not None:
+        comprobaciones["usuario_existe"] = select(Usuario.usuario_id).where(Usuario.usuario_id == usuario_id).exists()
+    if moneda is not None:
+        comprobaciones["moneda_valida"] = select(Moneda.codigo).where(Moneda.codigo == moneda).exists()
+    if email is not None:
+        otro_usuario = select(Usuario.usuario_id).where(func.lower(Usuario.email) == email.lower())
+        if usuario_id is not None:
+            otro_usuario = otro_usuario.where(Usuario.usuario_id != usuario_id)
+        comprobaciones["email_registrado"] = otro_usuario.exists()
+    if not comprobaciones:
+        return
+
+    fila = (await db.execute(select(*(c.label(n) for n, c in comprobaciones.items())))).one()._mapping
+    if fila.get("usuario_existe") is False:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Usuario no encontrado"
+        )
+    if fila.get("moneda_valida") is False:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Moneda no soportada"
+        )
+    if fila.get("email_registrado"):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="El email ya está registrado"
         )
+
+@router.post("/", response_model=UsuarioResponse, status_code=status.HTTP_201_CREATED)
+async def crear_usuario(usuario: UsuarioCreate, db: AsyncSession = Depends(get_db)):
+    """
+    Crear un nuevo usuario
+    """
+    # Moneda del catálogo y email libre antes de calcular el hash
+    await _validar_antes_del_hash(db, usuario.moneda_principal, usuario.email)
+    password_hash = await hash_password(usuario.password)
     
-    # Crear el nuevo usuario
-    nuevo_usuario = Usuario(
-        email=usuario.email,
-        nombre=usuario.nombre,
-        apellido=usuario.apellido,
-        password_hash=hash_password(usuario.password),
-        moneda_principal=usuario.moneda_principal,
-        zona_horaria=usuario.zona_horaria,
-        idioma=usuario.idioma
+    # Crear el nuevo usuario. Si otro registro con el mismo email se confirmó
+    # después de la validación, ON CONFLICT DO NOTHING no devuelve fila
+    nuevo_usuario = await db.scalar(
+        insert(Usuario)
+        .values(
+            email=usuario.email,
+            nombre=usuario.nombre,
+            apellido=usuario.apellido,
+            password_hash=password_hash,
+            moneda_principal=usuario.moneda_principal,
+            zona_horaria=usuario.zona_horaria,
+            idioma=usuario.idioma
+        )
+        .on_conflict_do_nothing()
+        .returning(Usuario)
     )
+    if nuevo_usuario is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="El email ya está registrado"
+        )
     
-    db.add(nuevo_usuario)
-    db.commit()
-    db.refresh(nuevo_usuario)
+    await db.commit()
     
     return nuevo_usuario
 
 @router.get("/", response_model=List[UsuarioResponse])
-async def obtener_usuarios(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+async def obtener_usuarios(
+    request: Request,
+    skip: int = 0,
+    limit: int = 100,
+    formato: str = Query("json", pattern="^(json|ndjson)$", description="json (lista) o ndjson (un usuario por línea, en streaming)"),
+    db: AsyncSession = Depends(get_db)
+):
     """
     Obtener todos los usuarios con paginación
     """
-    usuarios = db.query(Usuario).offset(skip).limit(limit).all()
-    return usuarios
+    consulta = select(*_COLUMNAS_LISTA_USUARIOS).offset(skip).limit(limit)
+    if formato == "ndjson":
+        return respuesta_ndjson(request.app.state.sessionmaker, consulta, ADAPTADOR_LISTA_USUARIOS)
+    
+    result = await db.execute(consulta)
+    usuarios = result.all()
+    return respuesta_filas(usuarios)
 
 @router.get("/{usuario_id}", response_model=UsuarioResponse)
-async def obtener_usuario(usuario_id: int, db: Session = Depends(get_db)):
+async def obtener_usuario(usuario_id: int, db: AsyncSession = Depends(get_db)):
     """
     Obtener un usuario específico por ID
     """
-    usuario = db.query(Usuario).filter(Usuario.usuario_id == usuario_id).first()
+    usuario = await db.scalar(_CONSULTA_USUARIO_POR_ID, {"usuario_id": usuario_id})
     if not usuario:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -68,58 +208,98 @@ async def obtener_usuario(usuario_id: int, db: Session = Depends(get_db)):
     return usuario
 
 @router.put("/{usuario_id}", response_model=UsuarioResponse)
-async def actualizar_usuario(usuario_id: int, usuario_update: UsuarioUpdate, db: Session = Depends(get_db)):
+async def actualizar_usuario(usuario_id: int, usuario_update: UsuarioUpdate, db: AsyncSession = Depends(get_db)):
     """
     Actualizar datos de un usuario
     """
-    # Verificar que el usuario existe
-    usuario = db.query(Usuario).filter(Usuario.usuario_id == usuario_id).first()
-    if not usuario:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Usuario no encontrado"
+    # Actualizar solo los campos proporcionados; la contraseña se guarda hasheada
+    datos_actualizados = {
+        campo: getattr(usuario_update, campo)
+        for campo in usuario_update.model_fields_set
+        if campo != "password"
+    }
+    if usuario_update.password:
+        # Usuario, moneda y email se validan antes de calcular el hash
+        await _validar_antes_del_hash(
+            db,
+            datos_actualizados.get("moneda_principal"),
+            datos_actualizados.get("email"),
+            usuario_id
         )
+        datos_actualizados["password_hash"] = await hash_password(usuario_update.password)
+    if not datos_actualizados:
+        usuario = await db.scalar(_CONSULTA_USUARIO_POR_ID, {"usuario_id": usuario_id})
+        if not usuario:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Usuario no encontrado"
+            )
+        return usuario
     
-    # Verificar si se está actualizando el email y si ya existe
-    if usuario_update.email and usuario_update.email != usuario.email:
-        email_existente = db.query(Usuario).filter(
-            Usuario.email == usuario_update.email,
-            Usuario.usuario_id != usuario_id
-        ).first()
-        if email_existente:
+    # Un solo UPDATE ... RETURNING con las columnas modificadas: la existencia la
+    # decide el WHERE, y el email repetido o la moneda fuera del catálogo los
+    # rechazan los índices únicos y fk_usuario_moneda en la misma sentencia
+    try:
+        usuario = await db.scalar(
+            update(Usuario)
+            .where(Usuario.usuario_id == usuario_id)
+            .values(**datos_actualizados)
+            .returning(Usuario)
+            .execution_options(synchronize_session=False)
+        )
+    except IntegrityError as error:
+        await db.rollback()
+        restriccion = restriccion_violada(error)
+        if restriccion in _RESTRICCIONES_EMAIL:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="El email ya está registrado"
             )
+        if restriccion == 'fk_usuario_moneda':
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Moneda no soportada"
+            )
+        raise
     
-    # Actualizar solo los campos proporcionados
-    update_data = usuario_update.model_dump(exclude_unset=True)
-    
-    # Si se actualiza la contraseña, hashearla
-    if "password" in update_data:
-        update_data["password_hash"] = hash_password(update_data.pop("password"))
-    
-    for field, value in update_data.items():
-        setattr(usuario, field, value)
+    if usuario is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Usuario no encontrado"
+        )
     
-    db.commit()
-    db.refresh(usuario)
+    await db.commit()
     
     return usuario
 
 @router.delete("/{usuario_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def eliminar_usuario(usuario_id: int, db: Session = Depends(get_db)):
+async def eliminar_usuario(usuario_id: int, db: AsyncSession = Depends(get_db)):
     """
     Eliminar un usuario
     """
-    usuario = db.query(Usuario).filter(Usuario.usuario_id == usuario_id).first()
-    if not usuario:
+    # Un solo DELETE ... RETURNING: no hace falta cargar el usuario, las
+    # relaciones las borra la base de datos (ON DELETE CASCADE)
+    try:
+        eliminado = await db.scalar(
+            delete(Usuario).where(Usuario.usuario_id == usuario_id).returning(Usuario.usuario_id)
+        )
+    except IntegrityError as error:
+        await db.rollback()
+        # Las transacciones no se borran en cascada: conservan el historial
+        if restriccion_violada(error) == 'fk_transaccion_usuario':
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="El usuario tiene transacciones registradas"
+            )
+        raise
+    if eliminado is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Usuario no encontrado"
         )
     
-    db.delete(usuario)
-    db.commit()
+    await db.commit()
+    # Las cuentas del usuario se eliminan en cascada
+    await invalidar_cache(NAMESPACE_CUENTAS)
     
     return None
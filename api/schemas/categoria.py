@@ -1,14 +1,20 @@
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, TypeAdapter, Field, field_validator
 from datetime import datetime
-from typing import Optional
+from typing import List, Literal, Optional
 from decimal import Decimal
+from .comunes import ColorHex
+
+TipoTransaccion = Literal['INGRESO', 'GASTO', 'TRANSFERENCIA', 'AJUSTE']
 
 class CategoriaBase(BaseModel):
+    # Pydantic recorta los espacios: un nombre en blanco no pasa min_length
+    model_config = ConfigDict(str_strip_whitespace=True)
+
     nombre: str = Field(..., min_length=1, max_length=100, description="Nombre de la categoría")
     descripcion: Optional[str] = Field(None, description="Descripción de la categoría")
-    color_hex: str = Field(default='#6B7280', pattern='^#[0-9A-Fa-f]{6}$', description="Color en formato hexadecimal")
+    color_hex: ColorHex = Field(default='#6B7280', description="Color en formato hexadecimal")
     icono: Optional[str] = Field(None, max_length=50, description="Icono de la categoría")
-    tipo_transaccion: str = Field(..., description="Tipo de transacción: 'INGRESO', 'GASTO', 'TRANSFERENCIA', 'AJUSTE'")
+    tipo_transaccion: TipoTransaccion = Field(..., description="Tipo de transacción: 'INGRESO', 'GASTO', 'TRANSFERENCIA', 'AJUSTE'")
     es_subcategoria: bool = Field(default=False, description="Si es subcategoría o categoría principal")
     categoria_padre_id: Optional[int] = Field(None, gt=0, description="ID de la categoría padre (solo para subcategorías)")
     activa: bool = Field(default=True, description="Categoría activa")
@@ -16,31 +22,6 @@ class CategoriaBase(BaseModel):
 
 # Clase con validadores compartidos
 class CategoriaValidators:
-    @field_validator('nombre')
-    @classmethod
-    def validar_nombre_no_vacio(cls, v: Optional[str]) -> Optional[str]:
-        if v is not None and len(v.strip()) == 0:
-            raise ValueError('El nombre no puede estar vacío o contener solo espacios')
-        return v
-    
-    @field_validator('tipo_transaccion')
-    @classmethod
-    def validar_tipo_transaccion(cls, v: Optional[str]) -> Optional[str]:
-        if v is not None:
-            tipos_validos = {'INGRESO', 'GASTO', 'TRANSFERENCIA', 'AJUSTE'}
-            if v not in tipos_validos:
-                raise ValueError(f'Tipo de transacción inválido. Debe ser uno de: {", ".join(sorted(tipos_validos))}')
-        return v
-    
-    @field_validator('color_hex')
-    @classmethod
-    def validar_color_hex(cls, v: Optional[str]) -> Optional[str]:
-        if v is not None:
-            import re
-            if not re.match(r'^#[0-9A-Fa-f]{6}$', v):
-                raise ValueError('El color debe ser un valor hexadecimal válido (ej: #6B7280)')
-        return v
-    
     @field_validator('categoria_padre_id')
     @classmethod
     def validar_logica_subcategoria(cls, v: Optional[int], info) -> Optional[int]:
@@ -60,20 +41,25 @@ class CategoriaCreate(CategoriaBase, CategoriaValidators):
     pass
 
 class CategoriaUpdate(BaseModel, CategoriaValidators):
+    model_config = ConfigDict(str_strip_whitespace=True)
+
     nombre: Optional[str] = Field(None, min_length=1, max_length=100)
     descripcion: Optional[str] = Field(None)
-    color_hex: Optional[str] = Field(None, pattern='^#[0-9A-Fa-f]{6}$')
+    color_hex: Optional[ColorHex] = Field(None)
     icono: Optional[str] = Field(None, max_length=50)
-    tipo_transaccion: Optional[str] = Field(None)
+    tipo_transaccion: Optional[TipoTransaccion] = Field(None)
     es_subcategoria: Optional[bool] = None
     categoria_padre_id: Optional[int] = Field(None, gt=0)
     activa: Optional[bool] = None
     orden_mostrar: Optional[int] = None
 
 class CategoriaResponse(CategoriaBase):
+    model_config = ConfigDict(from_attributes=True)
+
     categoria_id: int
     creada_en: datetime
     actualizada_en: datetime
 
-    class Config:
-        from_attributes = True
+# Validación de una lista de categorías nuevas en una sola llamada al núcleo
+# de Pydantic (importaciones), en lugar de un CategoriaCreate(**fila) por fila
+ADAPTADOR_LISTA_CATEGORIAS_CREATE = TypeAdapter(List[CategoriaCreate])
@@ -0,0 +1,23 @@
+from decimal import Decimal
+from pydantic import BeforeValidator, Field, StringConstraints
+from typing import Annotated, Literal
+
+def _a_mayusculas(v):
+    return v.upper() if isinstance(v, str) else v
+
+# Los valores de los ENUM se aceptan en minúsculas; los válidos los comprueba el Literal
+EN_MAYUSCULAS = BeforeValidator(_a_mayusculas)
+
+Prioridad = Annotated[Literal['ALTA', 'MEDIA', 'BAJA'], EN_MAYUSCULAS]
+
+# #RRGGBB, guardado en mayúsculas como exige check_color_hex_valido
+ColorHex = Annotated[str, StringConstraints(pattern=r'^#[0-9A-Fa-f]{6}$', to_upper=True)]
+
+# Cota inferior de los montos (gt/ge) y saldo inicial por defecto
+MONTO_CERO = Decimal('0.00')
+
+# Montos de las columnas DECIMAL(15,2): pydantic-core rechaza los que no caben
+Monto = Annotated[Decimal, Field(gt=MONTO_CERO, max_digits=15, decimal_places=2)]
+MontoNoNegativo = Annotated[Decimal, Field(ge=MONTO_CERO, max_digits=15, decimal_places=2)]
+# Saldos, que pueden ser negativos (cuentas por cobrar)
+Importe = Annotated[Decimal, Field(max_digits=15, decimal_places=2)]
@@ -1,27 +1,48 @@
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, TypeAdapter, Field, field_validator
 from datetime import datetime
-from typing import Optional
+from typing import List, Literal, Optional
 from decimal import Decimal
+from .comunes import MONTO_CERO, ColorHex, Importe, MontoNoNegativo
+from .subcuenta import SubcuentaResponse
+from .deuda import DeudaResponse
+from .compromiso_recurrente import CompromisoRecurrenteResponse
+
+TipoCuenta = Literal[
+    'EFECTIVO',
+    'CUENTA_CORRIENTE',
+    'CUENTA_AHORRO',
+    'CUENTA_NOMINA',
+    'TARJETA_CREDITO',
+    'TARJETA_DEBITO',
+    'INVERSION',
+    'PRESTAMO',
+    'WALLET_DIGITAL',
+    'CRIPTOMONEDA',
+    'OTRO'
+]
 
 class CuentaBase(BaseModel):
+    # Pydantic recorta los espacios: un nombre en blanco no pasa min_length
+    model_config = ConfigDict(str_strip_whitespace=True)
+
     nombre: str = Field(..., min_length=1, max_length=100, description="Nombre de la cuenta")
-    tipo_cuenta: str = Field(..., description="Tipo de cuenta")
+    tipo_cuenta: TipoCuenta = Field(..., description="Tipo de cuenta")
     institucion: Optional[str] = Field(None, max_length=100, description="Institución financiera")
     numero_cuenta: Optional[str] = Field(None, max_length=50, description="Número de cuenta")
     moneda: str = Field(default='USD', pattern='^[A-Z]{3}$', description="Código ISO de moneda")
     
     # Configuración de crédito
-    limite_credito: Optional[Decimal] = Field(None, ge=Decimal('0'), description="Límite de crédito (solo tarjetas)")
+    limite_credito: Optional[MontoNoNegativo] = Field(None, description="Límite de crédito (solo tarjetas)")
     
     # Información de tarjetas
     dia_corte: Optional[int] = Field(None, ge=1, le=31, description="Día de corte (1-31)")
     dia_pago: Optional[int] = Field(None, ge=1, le=31, description="Día de pago (1-31)")
-    tasa_interes: Optional[Decimal] = Field(None, ge=Decimal('0'), le=Decimal('100'), description="Tasa de interés (%)")
+    tasa_interes: Optional[Decimal] = Field(None, ge=MONTO_CERO, le=Decimal('100'), description="Tasa de interés (%)")
     
     # Configuración
     activa: bool = Field(default=True, description="Cuenta activa")
     incluir_en_total: bool = Field(default=True, description="Incluir en total general")
-    color_hex: str = Field(default='#3B82F6', pattern='^#[0-9A-Fa-f]{6}$', description="Color en formato hexadecimal")
+    color_hex: ColorHex = Field(default='#3B82F6', description="Color en formato hexadecimal")
     icono: Optional[str] = Field(None, max_length=50, description="Icono de la cuenta")
     orden_mostrar: int = Field(default=0, description="Orden de visualización")
     
@@ -30,42 +51,6 @@ class CuentaBase(BaseModel):
     notas: Optional[str] = Field(None, description="Notas adicionales")
 
 class CuentaValidators:
-    @field_validator('tipo_cuenta')
-    @classmethod
-    def validar_tipo_cuenta(cls, v: Optional[str]) -> Optional[str]:
-        if v is not None:
-            tipos_validos = {
-                'EFECTIVO',
-                'CUENTA_CORRIENTE',
-                'CUENTA_AHORRO',
-                'CUENTA_NOMINA',
-                'TARJETA_CREDITO',
-                'TARJETA_DEBITO',
-                'INVERSION',
-                'PRESTAMO',
-                'WALLET_DIGITAL',
-                'CRIPTOMONEDA',
-                'OTRO'
-            }
-            if v not in tipos_validos:
-                raise ValueError(f'Tipo de cuenta inválido. Debe ser uno de: {", ".join(sorted(tipos_validos))}')
-        return v
-    
-    @field_validator('nombre')
-    @classmethod
-    def validar_nombre_no_vacio(cls, v: Optional[str]) -> Optional[str]:
-        if v is not None and len(v.strip()) == 0:
-            raise ValueError('El nombre no puede estar vacío')
-        return v
-    
-    @field_validator('moneda')
-    @classmethod
-    def validar_moneda(cls, v: Optional[str]) -> Optional[str]:
-        if v is not None:
-            if len(v) != 3 or not v.isupper() or not v.isalpha():
-                raise ValueError('La moneda debe ser un código ISO de 3 letras mayúsculas (ej: USD, EUR, MXN)')
-        return v
-    
     @field_validator('limite_credito')
     @classmethod
     def validar_limite_credito(cls, v: Optional[Decimal], info) -> Optional[Decimal]:
@@ -79,27 +64,31 @@ class CuentaValidators:
 
 class CuentaCreate(CuentaBase, CuentaValidators):
     usuario_id: int = Field(..., gt=0, description="ID del usuario propietario")
-    saldo_inicial: Optional[Decimal] = Field(default=Decimal('0.00'), description="Saldo inicial (se creará transacción AJUSTE_INICIAL automáticamente si es mayor a 0)")
+    saldo_inicial: Optional[Importe] = Field(default=MONTO_CERO, description="Saldo inicial (se creará transacción AJUSTE_INICIAL automáticamente si es mayor a 0)")
 
 class CuentaUpdate(BaseModel, CuentaValidators):
+    model_config = ConfigDict(str_strip_whitespace=True)
+
     nombre: Optional[str] = Field(None, min_length=1, max_length=100)
-    tipo_cuenta: Optional[str] = Field(None, description="Tipo de cuenta")
+    tipo_cuenta: Optional[TipoCuenta] = Field(None, description="Tipo de cuenta")
     institucion: Optional[str] = Field(None, max_length=100)
     numero_cuenta: Optional[str] = Field(None, max_length=50)
     moneda: Optional[str] = Field(None, pattern='^[A-Z]{3}$')
-    limite_credito: Optional[Decimal] = Field(None, ge=Decimal('0'))
+    limite_credito: Optional[MontoNoNegativo] = None
     dia_corte: Optional[int] = Field(None, ge=1, le=31)
     dia_pago: Optional[int] = Field(None, ge=1, le=31)
-    tasa_interes: Optional[Decimal] = Field(None, ge=Decimal('0'), le=Decimal('100'))
+    tasa_interes: Optional[Decimal] = Field(None, ge=MONTO_CERO, le=Decimal('100'))
     activa: Optional[bool] = None
     incluir_en_total: Optional[bool] = None
-    color_hex: Optional[str] = Field(None, pattern='^#[0-9A-Fa-f]{6}$')
+    color_hex: Optional[ColorHex] = Field(None)
     icono: Optional[str] = Field(None, max_length=50)
     orden_mostrar: Optional[int] = None
     descripcion: Optional[str] = None
     notas: Optional[str] = None
 
 class CuentaResponse(CuentaBase):
+    model_config = ConfigDict(from_attributes=True)
+
     cuenta_id: int
     usuario_id: int
     creada_en: datetime
@@ -107,5 +96,13 @@ class CuentaResponse(CuentaBase):
     actualizada_en: datetime
     ultimo_movimiento: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
+# Adaptador para validar de una vez una lista de cuentas nuevas (importaciones)
+ADAPTADOR_LISTA_CUENTAS_CREATE = TypeAdapter(List[CuentaCreate])
+
+class CuentaDetalleResponse(CuentaResponse):
+    """Cuenta con sus subcuentas, deudas y compromisos recurrentes"""
+    model_config = ConfigDict(from_attributes=True)
+
+    subcuentas: List[SubcuentaResponse] = []
+    deudas: List[DeudaResponse] = []
+    compromisos_recurrentes: List[CompromisoRecurrenteResponse] = []
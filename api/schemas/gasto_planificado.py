@@ -1,56 +1,30 @@
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from datetime import datetime, date
-from typing import Optional
+from typing import Annotated, Literal, Optional
 from decimal import Decimal
+from .comunes import EN_MAYUSCULAS, MONTO_CERO, ColorHex, Monto, MontoNoNegativo, Prioridad
+
+EstadoGastoPlanificado = Annotated[Literal['PENDIENTE', 'EN_PROGRESO', 'COMPLETADO', 'CANCELADO', 'VENCIDO'], EN_MAYUSCULAS]
 
 class GastoPlanificadoBase(BaseModel):
+    # Pydantic recorta los espacios: una descripción en blanco no pasa min_length
+    model_config = ConfigDict(str_strip_whitespace=True)
+
     subcuenta_id: int = Field(..., gt=0, description="ID de la subcuenta asociada")
     descripcion: str = Field(..., min_length=1, description="Descripción del gasto planificado")
     categoria: Optional[str] = Field(None, max_length=100, description="Categoría del gasto")
-    monto_total: Decimal = Field(..., gt=Decimal('0.00'), description="Monto total planificado")
-    monto_gastado: Decimal = Field(Decimal('0.00'), ge=Decimal('0.00'), description="Monto ya gastado")
+    monto_total: Monto = Field(..., description="Monto total planificado")
+    monto_gastado: MontoNoNegativo = Field(MONTO_CERO, description="Monto ya gastado")
     fecha_creacion: date = Field(..., description="Fecha de creación")
     fecha_objetivo: Optional[date] = Field(None, description="Fecha objetivo para completar")
     fecha_completado: Optional[date] = Field(None, description="Fecha en que se completó")
-    estado: str = Field("PENDIENTE", description="Estado del gasto planificado")
-    prioridad: str = Field("MEDIA", description="Prioridad del gasto")
-    color_hex: str = Field("#F59E0B", description="Color en hexadecimal")
+    estado: EstadoGastoPlanificado = Field("PENDIENTE", description="Estado del gasto planificado")
+    prioridad: Prioridad = Field("MEDIA", description="Prioridad del gasto")
+    color_hex: ColorHex = Field("#F59E0B", description="Color en hexadecimal")
     notas: Optional[str] = Field(None, description="Notas adicionales")
 
-class GastoPlanificadoValidators:
-    @field_validator('descripcion')
-    @classmethod
-    def validar_descripcion_no_vacia(cls, v: str) -> str:
-        if not v or not v.strip():
-            raise ValueError('La descripción no puede estar vacía')
-        return v.strip()
-    
-    @field_validator('estado')
-    @classmethod
-    def validar_estado(cls, v: str) -> str:
-        estados_validos = {'PENDIENTE', 'EN_PROGRESO', 'COMPLETADO', 'CANCELADO', 'VENCIDO'}
-        v_upper = v.upper()
-        if v_upper not in estados_validos:
-            raise ValueError(f'El estado debe ser uno de: {", ".join(estados_validos)}')
-        return v_upper
-    
-    @field_validator('prioridad')
-    @classmethod
-    def validar_prioridad(cls, v: str) -> str:
-        prioridades_validas = {'ALTA', 'MEDIA', 'BAJA'}
-        v_upper = v.upper()
-        if v_upper not in prioridades_validas:
-            raise ValueError(f'La prioridad debe ser una de: {", ".join(prioridades_validas)}')
-        return v_upper
-    
-    @field_validator('color_hex')
-    @classmethod
-    def validar_color_hex(cls, v: str) -> str:
-        import re
-        if not re.match(r'^#[0-9A-Fa-f]{6}$', v):
-            raise ValueError('El color debe ser un código hexadecimal válido (ej: #F59E0B)')
-        return v.upper()
-    
+class GastoPlanificadoValidatorsEntreCampos:
+    """Validaciones entre campos; solo para creación (en una actualización parcial falta el resto del gasto)"""
     @field_validator('monto_gastado')
     @classmethod
     def validar_monto_gastado(cls, v, info):
@@ -69,39 +43,39 @@ class GastoPlanificadoValidators:
             raise ValueError('La fecha objetivo debe ser posterior a la fecha de creación')
         return v
 
-class GastoPlanificadoCreate(GastoPlanificadoBase, GastoPlanificadoValidators):
+class GastoPlanificadoCreate(GastoPlanificadoBase, GastoPlanificadoValidatorsEntreCampos):
     """Schema para crear un nuevo gasto planificado"""
     pass
 
-class GastoPlanificadoUpdate(BaseModel, GastoPlanificadoValidators):
+class GastoPlanificadoUpdate(BaseModel):
     """Schema para actualizar un gasto planificado"""
+    model_config = ConfigDict(str_strip_whitespace=True)
+
     subcuenta_id: Optional[int] = Field(None, gt=0, description="ID de la subcuenta asociada")
     descripcion: Optional[str] = Field(None, min_length=1, description="Descripción del gasto")
     categoria: Optional[str] = Field(None, max_length=100, description="Categoría del gasto")
-    monto_total: Optional[Decimal] = Field(None, gt=Decimal('0.00'), description="Monto total planificado")
-    monto_gastado: Optional[Decimal] = Field(None, ge=Decimal('0.00'), description="Monto gastado")
+    monto_total: Optional[Monto] = Field(None, description="Monto total planificado")
+    monto_gastado: Optional[MontoNoNegativo] = Field(None, description="Monto gastado")
     fecha_creacion: Optional[date] = Field(None, description="Fecha de creación")
     fecha_objetivo: Optional[date] = Field(None, description="Fecha objetivo")
     fecha_completado: Optional[date] = Field(None, description="Fecha de completado")
-    estado: Optional[str] = Field(None, description="Estado del gasto")
-    prioridad: Optional[str] = Field(None, description="Prioridad")
-    color_hex: Optional[str] = Field(None, description="Color hexadecimal")
+    estado: Optional[EstadoGastoPlanificado] = Field(None, description="Estado del gasto")
+    prioridad: Optional[Prioridad] = Field(None, description="Prioridad")
+    color_hex: Optional[ColorHex] = Field(None, description="Color hexadecimal")
     notas: Optional[str] = Field(None, description="Notas")
 
 class GastoPlanificadoResponse(GastoPlanificadoBase):
     """Schema para respuesta de gasto planificado"""
+    model_config = ConfigDict(from_attributes=True)
+
     gasto_planificado_id: int = Field(..., description="ID único del gasto planificado")
     creado_en: datetime = Field(..., description="Fecha de creación del registro")
     actualizado_en: datetime = Field(..., description="Fecha de última actualización")
 
-    class Config:
-        from_attributes = True
-
 class GastoPlanificadoConProgreso(GastoPlanificadoResponse):
     """Schema con información de progreso"""
+    model_config = ConfigDict(from_attributes=True)
+
     porcentaje_progreso: Decimal = Field(..., description="Porcentaje de progreso (0-100)")
     monto_restante: Decimal = Field(..., description="Monto restante por gastar")
     dias_restantes: Optional[int] = Field(None, description="Días restantes hasta fecha objetivo")
-
-    class Config:
-        from_attributes = True
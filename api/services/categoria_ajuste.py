@@ -0,0 +1,80 @@
+from sqlalchemy import func, literal_column
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from api.cache import NAMESPACE_CATEGORIAS, invalidar_cache, version_namespace
+from api.models.categoria import Categoria
+from typing import Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Categoría usada por las transacciones de AJUSTE_INICIAL al crear cuentas.
+# Su id se guarda en memoria del proceso al arrancar la app (precargar_categoria_ajuste)
+# junto con la versión de la caché de categorías: cualquier cambio en categorías
+# (también en otro proceso) cambia la versión y obliga a buscarla de nuevo, así
+# nunca se usa el id de una categoría eliminada.
+
+NOMBRE_CATEGORIA_AJUSTE = "Ajuste Inicial"
+
+# (versión de NAMESPACE_CATEGORIAS, categoria_id)
+_categoria_ajuste: Optional[Tuple[str, int]] = None
+
+async def obtener_categoria_ajuste(db: AsyncSession) -> Tuple[int, bool]:
+    """
+    Obtener el id de la categoría de ajustes iniciales, creándola si no existe.
+
+    Retorna (categoria_id, creada). Una categoría recién creada solo existe
+    en la transacción actual, así que no se guarda en memoria hasta que una
+    búsqueda posterior la encuentre ya confirmada.
+    """
+    global _categoria_ajuste
+    # Se lee antes de buscar: si las categorías cambian mientras tanto, el id
+    # queda guardado con la versión anterior y la siguiente llamada lo repite
+    version = await version_namespace(NAMESPACE_CATEGORIAS)
+    if version is not None and _categoria_ajuste is not None and _categoria_ajuste[0] == version:
+        return _categoria_ajuste[1], False
+
+    # Un solo INSERT ... ON CONFLICT sobre idx_categorias_nombre_unico: si la
+    # categoría ya existe, el DO UPDATE (sin cambios) hace que RETURNING la
+    # devuelva igual. xmax = 0 solo en filas recién insertadas.
+    sentencia = insert(Categoria).values(
+        nombre=NOMBRE_CATEGORIA_AJUSTE,
+        tipo_transaccion="AJUSTE",
+        descripcion="Categoría para ajustes de saldo inicial",
+        activa=True
+    )
+    fila = (await db.execute(
+        sentencia.on_conflict_do_update(
+            index_elements=[func.lower(Categoria.nombre), Categoria.tipo_transaccion, func.coalesce(Categoria.categoria_padre_id, literal_column("0"))],
+            index_where=Categoria.activa == True,
+            set_={"nombre": Categoria.nombre}
+        ).returning(Categoria.categoria_id, literal_column("xmax = 0").label("creada"))
+    )).one()
+
+    if not fila.creada and version is not None:
+        _categoria_ajuste = (version, fila.categoria_id)
+    return fila.categoria_id, fila.creada
+
+async def precargar_categoria_ajuste(sessionmaker: async_sessionmaker[AsyncSession]):
+    """
+    Crear si hace falta la categoría de ajustes y guardar su id al arrancar.
+
+    Si la base de datos no responde la app arranca igual: la primera cuenta
+    con saldo inicial hará la búsqueda.
+    """
+    global _categoria_ajuste
+    try:
+        async with sessionmaker() as db:
+            categoria_id, creada = await obtener_categoria_ajuste(db)
+            await db.commit()
+    except Exception:
+        logger.warning("No se pudo precargar la categoría de ajustes", exc_info=True)
+        return
+
+    # Ya confirmada: se puede guardar aunque se haya creado ahora, con la
+    # versión posterior a la invalidación que provoca su creación
+    if creada:
+        await invalidar_cache(NAMESPACE_CATEGORIAS)
+    version = await version_namespace(NAMESPACE_CATEGORIAS)
+    if version is not None:
+        _categoria_ajuste = (version, categoria_id)
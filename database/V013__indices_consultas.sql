@@ -0,0 +1,25 @@
+-- =====================================================
+-- MIGRACIÓN: índices compuestos para las consultas frecuentes
+-- Descripción: Cubre los filtros más usados por la API
+--              (cuentas por usuario/estado, compromisos por
+--              usuario/estado/día de pago)
+-- Dependencias: cuentas, compromisos_recurrentes
+-- =====================================================
+
+-- ============ CUENTAS ============
+-- idx_cuentas_usuario es parcial (activa = TRUE) y no sirve cuando se
+-- listan todas las cuentas de un usuario o las inactivas
+CREATE INDEX IF NOT EXISTS idx_cuentas_usuario_activa 
+ON cuentas(usuario_id, activa);
+
+-- ============ COMPROMISOS RECURRENTES ============
+-- (usuario_id, activo, dia_pago) cubre las mismas consultas que
+-- idx_compromisos_usuario y además el orden por día de pago
+DROP INDEX IF EXISTS idx_compromisos_usuario;
+
+CREATE INDEX IF NOT EXISTS idx_compromisos_usuario_activo_dia 
+ON compromisos_recurrentes(usuario_id, activo, dia_pago);
+
+-- ============ COMENTARIOS ============
+COMMENT ON INDEX idx_cuentas_usuario_activa IS 'Cuentas por usuario con o sin filtro de estado';
+COMMENT ON INDEX idx_compromisos_usuario_activo_dia IS 'Compromisos por usuario y estado ordenados por día de pago';
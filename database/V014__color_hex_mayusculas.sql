@@ -0,0 +1,51 @@
+-- =====================================================
+-- MIGRACIÓN: color_hex normalizado a mayúsculas
+-- Descripción: Los colores se guardan siempre como #RRGGBB en
+--              mayúsculas (la API los normaliza al asignarlos),
+--              así la restricción solo valida la clase [0-9A-F]
+--              en lugar de la expresión con mayúsculas/minúsculas
+-- Dependencias: categorias, cuentas, subcuentas, deudas,
+--               gastos_planificados, compromisos_recurrentes
+-- =====================================================
+
+-- ============ CATEGORIAS ============
+UPDATE categorias SET color_hex = UPPER(color_hex) WHERE color_hex <> UPPER(color_hex);
+
+ALTER TABLE categorias DROP CONSTRAINT check_color_hex_valido;
+ALTER TABLE categorias ADD CONSTRAINT check_color_hex_valido 
+    CHECK (color_hex ~ '^#[0-9A-F]{6}$');
+
+-- ============ CUENTAS ============
+UPDATE cuentas SET color_hex = UPPER(color_hex) WHERE color_hex <> UPPER(color_hex);
+
+ALTER TABLE cuentas DROP CONSTRAINT check_color_hex_valido;
+ALTER TABLE cuentas ADD CONSTRAINT check_color_hex_valido 
+    CHECK (color_hex ~ '^#[0-9A-F]{6}$');
+
+-- ============ SUBCUENTAS ============
+UPDATE subcuentas SET color_hex = UPPER(color_hex) WHERE color_hex <> UPPER(color_hex);
+
+ALTER TABLE subcuentas DROP CONSTRAINT check_color_hex_valido;
+ALTER TABLE subcuentas ADD CONSTRAINT check_color_hex_valido 
+    CHECK (color_hex ~ '^#[0-9A-F]{6}$');
+
+-- ============ DEUDAS ============
+UPDATE deudas SET color_hex = UPPER(color_hex) WHERE color_hex <> UPPER(color_hex);
+
+ALTER TABLE deudas DROP CONSTRAINT check_color_hex_valido;
+ALTER TABLE deudas ADD CONSTRAINT check_color_hex_valido 
+    CHECK (color_hex ~ '^#[0-9A-F]{6}$');
+
+-- ============ GASTOS PLANIFICADOS ============
+UPDATE gastos_planificados SET color_hex = UPPER(color_hex) WHERE color_hex <> UPPER(color_hex);
+
+ALTER TABLE gastos_planificados DROP CONSTRAINT check_color_hex_valido;
+ALTER TABLE gastos_planificados ADD CONSTRAINT check_color_hex_valido 
+    CHECK (color_hex ~ '^#[0-9A-F]{6}$');
+
+-- ============ COMPROMISOS RECURRENTES ============
+UPDATE compromisos_recurrentes SET color_hex = UPPER(color_hex) WHERE color_hex <> UPPER(color_hex);
+
+ALTER TABLE compromisos_recurrentes DROP CONSTRAINT check_color_hex_valido;
+ALTER TABLE compromisos_recurrentes ADD CONSTRAINT check_color_hex_valido 
+    CHECK (color_hex ~ '^#[0-9A-F]{6}$');
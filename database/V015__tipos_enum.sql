@@ -0,0 +1,688 @@
+-- =====================================================
+-- MIGRACIÓN: campos categóricos como tipos ENUM
+-- Descripción: Los campos tipo/estado/frecuencia que se guardaban
+--              como VARCHAR + CHECK IN (...) pasan a tipos ENUM de
+--              PostgreSQL (4 bytes por fila, comparación por OID).
+--              El ENUM reemplaza a la restricción CHECK de valores.
+--              Las vistas que dependen de estas columnas se
+--              recrean con su misma definición y las funciones
+--              que devuelven estas columnas como VARCHAR se
+--              actualizan con el cast explícito; ejecutar_item_plan
+--              deja de comparar con 'AHORRO', que no está en el ENUM.
+-- Dependencias: cuentas, deudas, movimientos_deuda,
+--               gastos_planificados, compromisos_recurrentes,
+--               plan_quincenal
+-- =====================================================
+
+-- ============ TIPOS ENUM ============
+
+CREATE TYPE tipo_cuenta_enum AS ENUM (
+    'EFECTIVO',
+    'CUENTA_CORRIENTE',
+    'CUENTA_AHORRO',
+    'CUENTA_NOMINA',
+    'TARJETA_CREDITO',
+    'TARJETA_DEBITO',
+    'INVERSION',
+    'PRESTAMO',
+    'WALLET_DIGITAL',
+    'CRIPTOMONEDA',
+    'OTRO'
+);
+
+CREATE TYPE tipo_deuda_enum AS ENUM (
+    'TARJETA',
+    'PRESTAMO',
+    'HIPOTECA',
+    'AUTO',
+    'POR_PAGAR',
+    'POR_COBRAR',
+    'OTRO'
+);
+
+CREATE TYPE estado_deuda_enum AS ENUM (
+    'ACTIVA',
+    'PAGADA',
+    'VENCIDA',
+    'REFINANCIADA',
+    'CANCELADA'
+);
+
+CREATE TYPE tipo_movimiento_deuda_enum AS ENUM (
+    'CARGO',
+    'PAGO',
+    'AJUSTE',
+    'INTERES',
+    'REFINANCIACION'
+);
+
+CREATE TYPE estado_gasto_planificado_enum AS ENUM (
+    'PENDIENTE',
+    'EN_PROGRESO',
+    'COMPLETADO',
+    'CANCELADO',
+    'VENCIDO'
+);
+
+CREATE TYPE prioridad_enum AS ENUM ('ALTA', 'MEDIA', 'BAJA');
+
+CREATE TYPE tipo_compromiso_enum AS ENUM ('INGRESO', 'EGRESO');
+
+CREATE TYPE frecuencia_compromiso_enum AS ENUM (
+    'DIARIA',
+    'SEMANAL',
+    'QUINCENAL',
+    'MENSUAL',
+    'BIMESTRAL',
+    'TRIMESTRAL',
+    'SEMESTRAL',
+    'ANUAL'
+);
+
+CREATE TYPE tipo_movimiento_plan_enum AS ENUM (
+    'TRANSFERENCIA_CUENTAS',
+    'MOVIMIENTO_SUBCUENTA',
+    'PAGO_DEUDA'
+);
+
+-- ============ VISTAS DEPENDIENTES ============
+-- ALTER COLUMN TYPE no se permite sobre columnas usadas por vistas:
+-- se eliminan aquí y se recrean al final con la misma definición
+
+DROP VIEW vista_saldos_usuario;
+DROP VIEW vista_deudas_progreso;
+DROP VIEW vista_movimientos_deuda_detalle;
+DROP VIEW vista_gastos_planificados_progreso;
+DROP VIEW vista_compromisos_estado;
+DROP VIEW vista_plan_detalle;
+
+-- ============ ÍNDICES PARCIALES DEPENDIENTES ============
+-- El predicado guardado compara estado::text, que con ENUM deja de ser
+-- IMMUTABLE: se recrean después del cambio de tipo
+
+DROP INDEX idx_deudas_estado_prioridad;
+DROP INDEX idx_deudas_proximo_pago;
+DROP INDEX idx_gastos_planificados_fecha_objetivo;
+
+-- ============ CUENTAS ============
+ALTER TABLE cuentas DROP CONSTRAINT check_tipo_cuenta_valido;
+ALTER TABLE cuentas
+    ALTER COLUMN tipo_cuenta TYPE tipo_cuenta_enum USING tipo_cuenta::tipo_cuenta_enum;
+
+-- ============ DEUDAS ============
+ALTER TABLE deudas DROP CONSTRAINT check_tipo_deuda_valido;
+ALTER TABLE deudas DROP CONSTRAINT check_estado_valido;
+ALTER TABLE deudas
+    ALTER COLUMN tipo TYPE tipo_deuda_enum USING tipo::tipo_deuda_enum,
+    ALTER COLUMN estado DROP DEFAULT,
+    ALTER COLUMN estado TYPE estado_deuda_enum USING estado::estado_deuda_enum,
+    ALTER COLUMN estado SET DEFAULT 'ACTIVA';
+
+-- ============ MOVIMIENTOS DE DEUDA ============
+ALTER TABLE movimientos_deuda DROP CONSTRAINT check_tipo_movimiento_valido;
+ALTER TABLE movimientos_deuda
+    ALTER COLUMN tipo TYPE tipo_movimiento_deuda_enum USING tipo::tipo_movimiento_deuda_enum;
+
+-- ============ GASTOS PLANIFICADOS ============
+ALTER TABLE gastos_planificados DROP CONSTRAINT check_estado_valido;
+ALTER TABLE gastos_planificados DROP CONSTRAINT check_prioridad_valida;
+ALTER TABLE gastos_planificados
+    ALTER COLUMN estado DROP DEFAULT,
+    ALTER COLUMN estado TYPE estado_gasto_planificado_enum USING estado::estado_gasto_planificado_enum,
+    ALTER COLUMN estado SET DEFAULT 'PENDIENTE',
+    ALTER COLUMN prioridad DROP DEFAULT,
+    ALTER COLUMN prioridad TYPE prioridad_enum USING prioridad::prioridad_enum,
+    ALTER COLUMN prioridad SET DEFAULT 'MEDIA';
+
+-- ============ COMPROMISOS RECURRENTES ============
+ALTER TABLE compromisos_recurrentes DROP CONSTRAINT check_tipo_valido;
+ALTER TABLE compromisos_recurrentes DROP CONSTRAINT check_frecuencia_valida;
+ALTER TABLE compromisos_recurrentes
+    ALTER COLUMN tipo TYPE tipo_compromiso_enum USING tipo::tipo_compromiso_enum,
+    ALTER COLUMN frecuencia TYPE frecuencia_compromiso_enum USING frecuencia::frecuencia_compromiso_enum;
+
+-- ============ PLAN QUINCENAL ============
+ALTER TABLE plan_quincenal DROP CONSTRAINT check_tipo_movimiento_valido;
+ALTER TABLE plan_quincenal
+    ALTER COLUMN tipo_movimiento TYPE tipo_movimiento_plan_enum USING tipo_movimiento::tipo_movimiento_plan_enum;
+
+-- 'AHORRO' nunca fue un tipo válido (check_tipo_movimiento_valido no lo
+-- admitía) y no existe en el ENUM: se recrea la regla sin esa rama
+ALTER TABLE plan_quincenal DROP CONSTRAINT check_destinos_segun_tipo;
+ALTER TABLE plan_quincenal
+    ADD CONSTRAINT check_destinos_segun_tipo
+        CHECK (
+            (tipo_movimiento = 'TRANSFERENCIA_CUENTAS' 
+                AND cuenta_origen_id IS NOT NULL 
+                AND cuenta_destino_id IS NOT NULL
+                AND cuenta_origen_id != cuenta_destino_id)
+            OR
+            (tipo_movimiento = 'MOVIMIENTO_SUBCUENTA' 
+                AND cuenta_origen_id IS NOT NULL 
+                AND subcuenta_destino_id IS NOT NULL)
+            OR
+            (tipo_movimiento = 'PAGO_DEUDA' 
+                AND cuenta_origen_id IS NOT NULL 
+                AND deuda_id IS NOT NULL)
+        );
+
+-- ============ RECREAR ÍNDICES PARCIALES ============
+CREATE INDEX idx_deudas_estado_prioridad 
+ON deudas(estado, prioridad) 
+WHERE estado = 'ACTIVA';
+
+CREATE INDEX idx_deudas_proximo_pago 
+ON deudas(proximo_pago) 
+WHERE estado = 'ACTIVA' AND proximo_pago IS NOT NULL;
+
+CREATE INDEX idx_gastos_planificados_fecha_objetivo 
+ON gastos_planificados(fecha_objetivo) 
+WHERE estado IN ('PENDIENTE', 'EN_PROGRESO');
+
+-- ============ RECREAR VISTAS ============
+
+-- Definición de V003__cuentas.sql
+CREATE VIEW vista_saldos_usuario AS
+SELECT 
+    u.usuario_id,
+    u.nombre || ' ' || u.apellido AS usuario_nombre,
+    u.moneda_principal,
+    
+    -- Saldos por tipo de cuenta
+    COALESCE(SUM(CASE WHEN c.tipo_cuenta = 'EFECTIVO' THEN c.saldo_actual END), 0) AS saldo_efectivo,
+    COALESCE(SUM(CASE WHEN c.tipo_cuenta IN ('CUENTA_CORRIENTE', 'CUENTA_AHORRO', 'CUENTA_NOMINA') THEN c.saldo_actual END), 0) AS saldo_bancos,
+    COALESCE(SUM(CASE WHEN c.tipo_cuenta = 'TARJETA_CREDITO' THEN ABS(c.saldo_actual) END), 0) AS deuda_credito,
+    COALESCE(SUM(CASE WHEN c.tipo_cuenta = 'INVERSION' THEN c.saldo_actual END), 0) AS saldo_inversiones,
+    
+    -- Total neto (solo cuentas que se incluyen en total)
+    COALESCE(SUM(CASE WHEN c.incluir_en_total = TRUE THEN c.saldo_actual END), 0) AS patrimonio_neto,
+    
+    -- Estadísticas generales
+    COUNT(CASE WHEN c.activa = TRUE THEN 1 END) AS total_cuentas_activas,
+    MAX(c.ultimo_movimiento) AS ultimo_movimiento_general
+    
+FROM usuarios u
+LEFT JOIN cuentas c ON u.usuario_id = c.usuario_id
+GROUP BY u.usuario_id, u.nombre, u.apellido, u.moneda_principal;
+
+-- Definición de V008__deudas.sql
+CREATE VIEW vista_deudas_progreso AS
+SELECT 
+    d.deuda_id,
+    d.usuario_id,
+    u.nombre || ' ' || u.apellido AS usuario_nombre,
+    d.tipo,
+    COALESCE(d.acreedor, d.deudor) AS contraparte,
+    d.descripcion,
+    d.saldo_inicial,
+    d.saldo_actual,
+    d.saldo_inicial - d.saldo_actual AS monto_pagado,
+    ROUND(((d.saldo_inicial - d.saldo_actual) / d.saldo_inicial) * 100, 2) AS porcentaje_pagado,
+    d.monto_cuota,
+    d.frecuencia_pago,
+    d.numero_cuotas,
+    d.cuotas_pagadas,
+    CASE 
+        WHEN d.numero_cuotas IS NOT NULL 
+        THEN d.numero_cuotas - d.cuotas_pagadas
+        ELSE NULL 
+    END AS cuotas_pendientes,
+    d.tasa_interes,
+    d.proximo_pago,
+    CASE 
+        WHEN d.proximo_pago IS NOT NULL 
+        THEN d.proximo_pago - CURRENT_DATE
+        ELSE NULL 
+    END AS dias_hasta_pago,
+    d.estado,
+    d.prioridad,
+    d.color_hex,
+    d.creada_en,
+    d.ultimo_pago
+FROM deudas d
+INNER JOIN usuarios u ON d.usuario_id = u.usuario_id
+ORDER BY 
+    CASE d.prioridad 
+        WHEN 'ALTA' THEN 1 
+        WHEN 'MEDIA' THEN 2 
+        WHEN 'BAJA' THEN 3 
+    END,
+    d.proximo_pago NULLS LAST;
+
+-- Definición de V009__movimientos_deuda.sql
+CREATE VIEW vista_movimientos_deuda_detalle AS
+SELECT 
+    md.movimiento_deuda_id,
+    md.deuda_id,
+    d.tipo AS tipo_deuda,
+    COALESCE(d.acreedor, d.deudor) AS contraparte,
+    d.descripcion AS descripcion_deuda,
+    md.transaccion_id,
+    md.fecha,
+    md.tipo AS tipo_movimiento,
+    md.monto,
+    md.capital_pagado,
+    md.interes_pagado,
+    md.interes_generado,
+    md.descripcion,
+    d.saldo_actual AS saldo_deuda_actual,
+    d.estado AS estado_deuda,
+    md.creado_en
+FROM movimientos_deuda md
+INNER JOIN deudas d ON md.deuda_id = d.deuda_id
+ORDER BY md.fecha DESC;
+
+-- Definición de V010__gastos_planificados.sql
+CREATE VIEW vista_gastos_planificados_progreso AS
+SELECT 
+    gp.gasto_planificado_id,
+    gp.subcuenta_id,
+    s.nombre AS subcuenta_nombre,
+    s.cuenta_id,
+    c.nombre AS cuenta_nombre,
+    c.usuario_id,
+    gp.descripcion,
+    gp.categoria,
+    gp.monto_total,
+    gp.monto_gastado,
+    gp.monto_total - gp.monto_gastado AS monto_pendiente,
+    ROUND((gp.monto_gastado / gp.monto_total) * 100, 2) AS porcentaje_progreso,
+    gp.fecha_objetivo,
+    CASE 
+        WHEN gp.fecha_objetivo IS NOT NULL 
+        THEN gp.fecha_objetivo - CURRENT_DATE
+        ELSE NULL 
+    END AS dias_hasta_objetivo,
+    CASE 
+        WHEN gp.fecha_objetivo IS NOT NULL AND gp.fecha_objetivo < CURRENT_DATE 
+        THEN TRUE
+        ELSE FALSE 
+    END AS esta_vencido,
+    gp.estado,
+    gp.prioridad,
+    gp.color_hex,
+    gp.fecha_creacion,
+    gp.fecha_completado
+FROM gastos_planificados gp
+INNER JOIN subcuentas s ON gp.subcuenta_id = s.subcuenta_id
+INNER JOIN cuentas c ON s.cuenta_id = c.cuenta_id
+ORDER BY 
+    CASE gp.prioridad 
+        WHEN 'ALTA' THEN 1 
+        WHEN 'MEDIA' THEN 2 
+        WHEN 'BAJA' THEN 3 
+    END,
+    gp.fecha_objetivo NULLS LAST;
+
+-- Definición de V011__compromisos_recurrentes.sql
+CREATE VIEW vista_compromisos_estado AS
+SELECT 
+    cr.compromiso_id,
+    cr.usuario_id,
+    u.nombre || ' ' || u.apellido AS usuario_nombre,
+    cr.descripcion,
+    cr.tipo,
+    cr.categoria,
+    cr.monto,
+    cr.frecuencia,
+    cr.dia_pago,
+    -- Cálculo dinámico del próximo evento
+    CASE
+        WHEN cr.ultimo_evento IS NOT NULL THEN
+            cr.ultimo_evento + CASE cr.frecuencia
+                WHEN 'DIARIA' THEN INTERVAL '1 day'
+                WHEN 'SEMANAL' THEN INTERVAL '7 days'
+                WHEN 'QUINCENAL' THEN INTERVAL '15 days'
+                WHEN 'MENSUAL' THEN INTERVAL '1 month'
+                WHEN 'BIMESTRAL' THEN INTERVAL '2 months'
+                WHEN 'TRIMESTRAL' THEN INTERVAL '3 months'
+                WHEN 'SEMESTRAL' THEN INTERVAL '6 months'
+                WHEN 'ANUAL' THEN INTERVAL '1 year'
+            END
+        ELSE
+            cr.fecha_inicio + CASE cr.frecuencia
+                WHEN 'DIARIA' THEN INTERVAL '1 day'
+                WHEN 'SEMANAL' THEN INTERVAL '7 days'
+                WHEN 'QUINCENAL' THEN INTERVAL '15 days'
+                WHEN 'MENSUAL' THEN INTERVAL '1 month'
+                WHEN 'BIMESTRAL' THEN INTERVAL '2 months'
+                WHEN 'TRIMESTRAL' THEN INTERVAL '3 months'
+                WHEN 'SEMESTRAL' THEN INTERVAL '6 months'
+                WHEN 'ANUAL' THEN INTERVAL '1 year'
+            END
+    END AS proximo_evento,
+    -- Días hasta el próximo evento
+    CASE 
+        WHEN cr.ultimo_evento IS NOT NULL THEN
+            EXTRACT(days FROM (cr.ultimo_evento + CASE cr.frecuencia
+                WHEN 'DIARIA' THEN INTERVAL '1 day'
+                WHEN 'SEMANAL' THEN INTERVAL '7 days'
+                WHEN 'QUINCENAL' THEN INTERVAL '15 days'
+                WHEN 'MENSUAL' THEN INTERVAL '1 month'
+                WHEN 'BIMESTRAL' THEN INTERVAL '2 months'
+                WHEN 'TRIMESTRAL' THEN INTERVAL '3 months'
+                WHEN 'SEMESTRAL' THEN INTERVAL '6 months'
+                WHEN 'ANUAL' THEN INTERVAL '1 year'
+            END - CURRENT_DATE))::INTEGER
+        ELSE
+            EXTRACT(days FROM (cr.fecha_inicio + CASE cr.frecuencia
+                WHEN 'DIARIA' THEN INTERVAL '1 day'
+                WHEN 'SEMANAL' THEN INTERVAL '7 days'
+                WHEN 'QUINCENAL' THEN INTERVAL '15 days'
+                WHEN 'MENSUAL' THEN INTERVAL '1 month'
+                WHEN 'BIMESTRAL' THEN INTERVAL '2 months'
+                WHEN 'TRIMESTRAL' THEN INTERVAL '3 months'
+                WHEN 'SEMESTRAL' THEN INTERVAL '6 months'
+                WHEN 'ANUAL' THEN INTERVAL '1 year'
+            END - CURRENT_DATE))::INTEGER
+    END AS dias_hasta_proximo,
+    -- Evento pendiente
+    CASE 
+        WHEN cr.ultimo_evento IS NOT NULL THEN
+            (cr.ultimo_evento + CASE cr.frecuencia
+                WHEN 'DIARIA' THEN INTERVAL '1 day'
+                WHEN 'SEMANAL' THEN INTERVAL '7 days'
+                WHEN 'QUINCENAL' THEN INTERVAL '15 days'
+                WHEN 'MENSUAL' THEN INTERVAL '1 month'
+                WHEN 'BIMESTRAL' THEN INTERVAL '2 months'
+                WHEN 'TRIMESTRAL' THEN INTERVAL '3 months'
+                WHEN 'SEMESTRAL' THEN INTERVAL '6 months'
+                WHEN 'ANUAL' THEN INTERVAL '1 year'
+            END) <= CURRENT_DATE
+        ELSE
+            (cr.fecha_inicio + CASE cr.frecuencia
+                WHEN 'DIARIA' THEN INTERVAL '1 day'
+                WHEN 'SEMANAL' THEN INTERVAL '7 days'
+                WHEN 'QUINCENAL' THEN INTERVAL '15 days'
+                WHEN 'MENSUAL' THEN INTERVAL '1 month'
+                WHEN 'BIMESTRAL' THEN INTERVAL '2 months'
+                WHEN 'TRIMESTRAL' THEN INTERVAL '3 months'
+                WHEN 'SEMESTRAL' THEN INTERVAL '6 months'
+                WHEN 'ANUAL' THEN INTERVAL '1 year'
+            END) <= CURRENT_DATE
+    END AS evento_pendiente,
+    cr.cuenta_destino_id,
+    c.nombre AS cuenta_destino_nombre,
+    cr.activo,
+    cr.auto_generar,
+    cr.fecha_inicio,
+    cr.fecha_fin,
+    cr.ultimo_evento,
+    cr.color_hex,
+    cr.icono,
+    cr.notas,
+    cr.creado_en
+FROM compromisos_recurrentes cr
+INNER JOIN usuarios u ON cr.usuario_id = u.usuario_id
+LEFT JOIN cuentas c ON cr.cuenta_destino_id = c.cuenta_id
+ORDER BY proximo_evento NULLS LAST;
+
+-- Definición de V012__plan_quincenal.sql
+CREATE VIEW vista_plan_detalle AS
+SELECT 
+    pq.item_id,
+    pq.usuario_id,
+    u.nombre || ' ' || u.apellido AS usuario_nombre,
+    pq.nombre AS item_nombre,
+    pq.descripcion,
+    pq.tipo_movimiento,
+    pq.monto,
+    -- Cuenta origen
+    pq.cuenta_origen_id,
+    co.nombre AS cuenta_origen_nombre,
+    co.saldo_actual AS saldo_cuenta_origen,
+    -- Cuenta destino
+    pq.cuenta_destino_id,
+    cd.nombre AS cuenta_destino_nombre,
+    -- Subcuenta destino
+    pq.subcuenta_destino_id,
+    sc.nombre AS subcuenta_destino_nombre,
+    sc.saldo_actual AS saldo_subcuenta,
+    -- Deuda
+    pq.deuda_id,
+    d.descripcion AS deuda_descripcion,
+    d.saldo_actual AS saldo_deuda,
+    -- Estado
+    pq.activo,
+    pq.ejecutado,
+    pq.ejecutado_en,
+    pq.prioridad,
+    pq.orden_ejecucion,
+    pq.transaccion_generada_id,
+    pq.creado_en
+FROM plan_quincenal pq
+INNER JOIN usuarios u ON pq.usuario_id = u.usuario_id
+LEFT JOIN cuentas co ON pq.cuenta_origen_id = co.cuenta_id
+LEFT JOIN cuentas cd ON pq.cuenta_destino_id = cd.cuenta_id
+LEFT JOIN subcuentas sc ON pq.subcuenta_destino_id = sc.subcuenta_id
+LEFT JOIN deudas d ON pq.deuda_id = d.deuda_id
+ORDER BY 
+    pq.orden_ejecucion,
+    CASE pq.prioridad 
+        WHEN 'ALTA' THEN 1 
+        WHEN 'MEDIA' THEN 2 
+        WHEN 'BAJA' THEN 3 
+    END;
+
+-- ============ FUNCIONES QUE DEVUELVEN VARCHAR ============
+-- RETURN QUERY exige que los tipos coincidan con RETURNS TABLE
+
+CREATE OR REPLACE FUNCTION resumen_movimientos_deuda(
+    p_deuda_id BIGINT,
+    p_fecha_desde TIMESTAMPTZ DEFAULT NOW() - INTERVAL '30 days',
+    p_fecha_hasta TIMESTAMPTZ DEFAULT NOW()
+)
+RETURNS TABLE (
+    tipo_movimiento VARCHAR,
+    cantidad_movimientos BIGINT,
+    monto_total DECIMAL,
+    total_capital DECIMAL,
+    total_interes DECIMAL
+) AS $$
+BEGIN
+    RETURN QUERY
+    SELECT
+        md.tipo::VARCHAR,
+        COUNT(*)::BIGINT,
+        SUM(md.monto),
+        SUM(COALESCE(md.capital_pagado, 0)),
+        SUM(COALESCE(md.interes_pagado, 0))
+    FROM movimientos_deuda md
+    WHERE md.deuda_id = p_deuda_id
+        AND md.fecha BETWEEN p_fecha_desde AND p_fecha_hasta
+    GROUP BY md.tipo
+    ORDER BY md.tipo;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION gastos_proximos_vencer(
+    p_usuario_id BIGINT,
+    p_dias INTEGER DEFAULT 30
+)
+RETURNS TABLE (
+    gasto_planificado_id BIGINT,
+    descripcion TEXT,
+    monto_total DECIMAL,
+    monto_gastado DECIMAL,
+    dias_restantes INTEGER,
+    prioridad VARCHAR
+) AS $$
+BEGIN
+    RETURN QUERY
+    SELECT
+        gp.gasto_planificado_id,
+        gp.descripcion,
+        gp.monto_total,
+        gp.monto_gastado,
+        (gp.fecha_objetivo - CURRENT_DATE)::INTEGER,
+        gp.prioridad::VARCHAR
+    FROM gastos_planificados gp
+    INNER JOIN subcuentas s ON gp.subcuenta_id = s.subcuenta_id
+    INNER JOIN cuentas c ON s.cuenta_id = c.cuenta_id
+    WHERE c.usuario_id = p_usuario_id
+        AND gp.estado IN ('PENDIENTE', 'EN_PROGRESO')
+        AND gp.fecha_objetivo IS NOT NULL
+        AND gp.fecha_objetivo BETWEEN CURRENT_DATE AND CURRENT_DATE + p_dias
+    ORDER BY gp.fecha_objetivo;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION eventos_compromisos_pendientes(
+    p_usuario_id BIGINT,
+    p_dias_adelante INTEGER DEFAULT 7
+)
+RETURNS TABLE (
+    compromiso_id BIGINT,
+    descripcion TEXT,
+    tipo VARCHAR,
+    monto DECIMAL,
+    proximo_evento DATE,
+    dias_restantes INTEGER
+) AS $$
+BEGIN
+    RETURN QUERY
+    SELECT
+        vce.compromiso_id,
+        vce.descripcion,
+        vce.tipo::VARCHAR,
+        vce.monto,
+        vce.proximo_evento,
+        vce.dias_hasta_proximo
+    FROM vista_compromisos_estado vce
+    WHERE vce.usuario_id = p_usuario_id
+        AND vce.activo = TRUE
+        AND vce.proximo_evento IS NOT NULL
+        AND vce.proximo_evento BETWEEN CURRENT_DATE AND CURRENT_DATE + p_dias_adelante
+    ORDER BY vce.proximo_evento;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ============ FUNCIONES QUE COMPARAN CON EL ENUM ============
+-- El CASE de ejecutar_item_plan convierte cada literal al ENUM: 'AHORRO'
+-- no existe en tipo_movimiento_plan_enum y haría fallar cada ejecución.
+-- RETURNING se califica con la tabla: transaccion_id es también una
+-- columna de RETURNS TABLE y PL/pgSQL la considera ambigua. Los tipos de
+-- movimiento son los que admiten movimientos_subcuenta (ASIGNACION) y
+-- movimientos_deuda (PAGO con su desglose: todo a capital)
+
+CREATE OR REPLACE FUNCTION ejecutar_item_plan(
+    p_item_id BIGINT,
+    p_usuario_id BIGINT
+)
+RETURNS TABLE (
+    exitoso BOOLEAN,
+    mensaje TEXT,
+    transaccion_id BIGINT
+) AS $$
+DECLARE
+    v_item RECORD;
+    v_transaccion_id BIGINT;
+    v_saldo_origen DECIMAL(15,2);
+    v_tipo_transaccion VARCHAR(20);
+BEGIN
+    -- Obtener el item del plan
+    SELECT * INTO v_item
+    FROM plan_quincenal
+    WHERE item_id = p_item_id
+        AND usuario_id = p_usuario_id
+        AND activo = TRUE
+        AND ejecutado = FALSE;
+    
+    IF NOT FOUND THEN
+        RETURN QUERY SELECT FALSE, 'Item no encontrado, ya ejecutado o inactivo'::TEXT, NULL::BIGINT;
+        RETURN;
+    END IF;
+    
+    -- Verificar saldo suficiente en cuenta origen
+    IF v_item.cuenta_origen_id IS NOT NULL THEN
+        SELECT saldo_actual INTO v_saldo_origen
+        FROM cuentas
+        WHERE cuenta_id = v_item.cuenta_origen_id;
+        
+        IF v_saldo_origen < v_item.monto THEN
+            RETURN QUERY SELECT FALSE, 'Saldo insuficiente en cuenta origen'::TEXT, NULL::BIGINT;
+            RETURN;
+        END IF;
+    END IF;
+    
+    -- Ejecutar según el tipo de movimiento
+    CASE v_item.tipo_movimiento
+        
+        -- ========== TRANSFERENCIA ENTRE CUENTAS ==========
+        WHEN 'TRANSFERENCIA_CUENTAS' THEN
+            INSERT INTO transacciones (
+                usuario_id, cuenta_origen_id, cuenta_destino_id,
+                tipo, monto, descripcion, fecha
+            ) VALUES (
+                p_usuario_id, v_item.cuenta_origen_id, v_item.cuenta_destino_id,
+                'TRANSFERENCIA', v_item.monto, 
+                'Plan: ' || v_item.nombre, CURRENT_DATE
+            ) RETURNING transacciones.transaccion_id INTO v_transaccion_id;
+        
+        -- ========== MOVIMIENTO A SUBCUENTA ==========
+        WHEN 'MOVIMIENTO_SUBCUENTA' THEN
+            -- Crear transacción de ajuste
+            INSERT INTO transacciones (
+                usuario_id, cuenta_origen_id,
+                tipo, monto, descripcion, fecha
+            ) VALUES (
+                p_usuario_id, v_item.cuenta_origen_id,
+                'AJUSTE', v_item.monto,
+                'Plan: ' || v_item.nombre || ' (Movimiento a subcuenta)', CURRENT_DATE
+            ) RETURNING transacciones.transaccion_id INTO v_transaccion_id;
+            
+            -- Crear movimiento de subcuenta
+            INSERT INTO movimientos_subcuenta (
+                subcuenta_id, transaccion_id, tipo, monto, descripcion, fecha
+            ) VALUES (
+                v_item.subcuenta_destino_id, v_transaccion_id,
+                'ASIGNACION', v_item.monto,
+                'Plan: ' || v_item.nombre, CURRENT_DATE
+            );
+        
+        -- ========== PAGO A DEUDA ==========
+        WHEN 'PAGO_DEUDA' THEN
+            -- Crear transacción de gasto
+            INSERT INTO transacciones (
+                usuario_id, cuenta_origen_id,
+                tipo, monto, descripcion, fecha
+            ) VALUES (
+                p_usuario_id, v_item.cuenta_origen_id,
+                'GASTO', v_item.monto,
+                'Plan: ' || v_item.nombre || ' (Pago deuda)', CURRENT_DATE
+            ) RETURNING transacciones.transaccion_id INTO v_transaccion_id;
+            
+            -- Crear movimiento de deuda
+            INSERT INTO movimientos_deuda (
+                deuda_id, transaccion_id, tipo, monto,
+                capital_pagado, interes_pagado, descripcion, fecha
+            ) VALUES (
+                v_item.deuda_id, v_transaccion_id,
+                'PAGO', v_item.monto,
+                v_item.monto, 0,
+                'Plan: ' || v_item.nombre, CURRENT_DATE
+            );
+    END CASE;
+    
+    -- Marcar item como ejecutado
+    UPDATE plan_quincenal
+    SET 
+        ejecutado = TRUE,
+        ejecutado_en = NOW(),
+        transaccion_generada_id = v_transaccion_id
+    WHERE item_id = p_item_id;
+    
+    RETURN QUERY SELECT TRUE, 'Ejecutado exitosamente'::TEXT, v_transaccion_id;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ============ COMENTARIOS ============
+COMMENT ON TYPE tipo_cuenta_enum IS 'Tipos de cuenta (cuentas.tipo_cuenta)';
+COMMENT ON TYPE tipo_deuda_enum IS 'Tipos de deuda (deudas.tipo)';
+COMMENT ON TYPE estado_deuda_enum IS 'Estados de una deuda (deudas.estado)';
+COMMENT ON TYPE tipo_movimiento_deuda_enum IS 'Tipos de movimiento de deuda (movimientos_deuda.tipo)';
+COMMENT ON TYPE estado_gasto_planificado_enum IS 'Estados de un gasto planificado (gastos_planificados.estado)';
+COMMENT ON TYPE prioridad_enum IS 'Prioridades ALTA/MEDIA/BAJA';
+COMMENT ON TYPE tipo_compromiso_enum IS 'Tipos de compromiso recurrente (compromisos_recurrentes.tipo)';
+COMMENT ON TYPE frecuencia_compromiso_enum IS 'Frecuencias de compromiso recurrente (compromisos_recurrentes.frecuencia)';
+COMMENT ON TYPE tipo_movimiento_plan_enum IS 'Tipos de movimiento del plan quincenal (plan_quincenal.tipo_movimiento)';
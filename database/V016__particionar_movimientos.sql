@@ -0,0 +1,357 @@
+-- =====================================================
+-- MIGRACIÓN: particionado mensual de movimientos por fecha
+-- Descripción: movimientos_deuda y movimientos_subcuenta crecen sin
+--              límite y casi siempre se consultan por rango de
+--              fecha reciente. Pasan a ser tablas particionadas
+--              por RANGE (fecha) con una partición por mes, así el
+--              planificador descarta particiones y el vacuum y los
+--              índices de cada mes se mantienen pequeños.
+--              La clave primaria incluye fecha (requisito de
+--              PostgreSQL para tablas particionadas).
+-- Dependencias: movimientos_deuda, movimientos_subcuenta
+-- NOTA: Las particiones de los próximos meses se crean con
+--       crear_particiones_mensuales(); debe ejecutarse de forma
+--       periódica (p. ej. una vez al mes con pg_cron), nada en el
+--       repositorio la programa todavía. Las filas fuera de rango
+--       (más de 12 meses adelante o anteriores a la primera
+--       partición) caen en la partición DEFAULT; al crear después
+--       la partición de ese mes, la función mueve esas filas desde
+--       DEFAULT (PostgreSQL no permite crearla si DEFAULT ya tiene
+--       filas de su rango).
+-- NOTA: Un UPDATE que cambia fecha de mes mueve la fila de
+--       partición y PostgreSQL lo ejecuta como DELETE + INSERT,
+--       disparando también los triggers BEFORE DELETE. Por eso los
+--       saldos de subcuentas los mantiene un único trigger AFTER
+--       INSERT OR UPDATE OR DELETE, como el de movimientos_deuda.
+-- =====================================================
+
+-- ============ FUNCIÓN PARA CREAR PARTICIONES MENSUALES ============
+
+CREATE OR REPLACE FUNCTION crear_particiones_mensuales(
+    p_tabla TEXT,
+    p_desde DATE DEFAULT CURRENT_DATE,
+    p_meses INTEGER DEFAULT 12
+)
+RETURNS INTEGER AS $$
+DECLARE
+    v_inicio DATE;
+    v_fin DATE;
+    v_nombre TEXT;
+    v_default TEXT := p_tabla || '_default';
+    v_en_default BOOLEAN := FALSE;
+    v_creadas INTEGER := 0;
+BEGIN
+    FOR i IN 0..p_meses - 1 LOOP
+        v_inicio := date_trunc('month', p_desde)::DATE + make_interval(months => i);
+        v_fin := (v_inicio + INTERVAL '1 month')::DATE;
+        v_nombre := p_tabla || '_' || to_char(v_inicio, 'YYYY_MM');
+
+        IF to_regclass(v_nombre) IS NULL THEN
+            IF to_regclass(v_default) IS NOT NULL THEN
+                EXECUTE format(
+                    'SELECT EXISTS (SELECT 1 FROM %I WHERE fecha >= %L AND fecha < %L)',
+                    v_default, v_inicio, v_fin
+                ) INTO v_en_default;
+            END IF;
+
+            IF v_en_default THEN
+                -- Las filas del mes que ya están en DEFAULT pasan a la nueva
+                -- partición antes de adjuntarla. Sin triggers: el movimiento
+                -- ya está aplicado en los saldos
+                EXECUTE format('CREATE TABLE %I (LIKE %I INCLUDING DEFAULTS INCLUDING CONSTRAINTS)', v_nombre, p_tabla);
+                EXECUTE format('ALTER TABLE %I DISABLE TRIGGER USER', v_default);
+                EXECUTE format(
+                    'WITH movidas AS (DELETE FROM %I WHERE fecha >= %L AND fecha < %L RETURNING *) '
+                    'INSERT INTO %I SELECT * FROM movidas',
+                    v_default, v_inicio, v_fin, v_nombre
+                );
+                EXECUTE format('ALTER TABLE %I ENABLE TRIGGER USER', v_default);
+                EXECUTE format(
+                    'ALTER TABLE %I ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                    p_tabla, v_nombre, v_inicio, v_fin
+                );
+            ELSE
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                    v_nombre, p_tabla, v_inicio, v_fin
+                );
+            END IF;
+            v_creadas := v_creadas + 1;
+        END IF;
+    END LOOP;
+
+    RETURN v_creadas;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ============ VISTAS DEPENDIENTES ============
+-- Se recrean al final sobre las nuevas tablas particionadas
+DROP VIEW vista_movimientos_deuda_detalle;
+DROP VIEW vista_movimientos_subcuenta_detalle;
+
+-- ============ MOVIMIENTOS DE DEUDA ============
+
+ALTER TABLE movimientos_deuda RENAME TO movimientos_deuda_sin_particionar;
+-- Liberar los nombres de las restricciones para la nueva tabla
+ALTER TABLE movimientos_deuda_sin_particionar RENAME CONSTRAINT movimientos_deuda_pkey TO movimientos_deuda_sin_particionar_pkey;
+ALTER TABLE movimientos_deuda_sin_particionar RENAME CONSTRAINT fk_mov_deuda TO fk_mov_deuda_sin_particionar;
+ALTER TABLE movimientos_deuda_sin_particionar RENAME CONSTRAINT fk_mov_deuda_trans TO fk_mov_deuda_trans_sin_particionar;
+
+-- Columnas, valores por defecto (incluida la secuencia), CHECKs y comentarios
+CREATE TABLE movimientos_deuda (
+    LIKE movimientos_deuda_sin_particionar INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING COMMENTS,
+
+    CONSTRAINT movimientos_deuda_pkey
+        PRIMARY KEY (movimiento_deuda_id, fecha),
+
+    CONSTRAINT fk_mov_deuda
+        FOREIGN KEY (deuda_id)
+        REFERENCES deudas(deuda_id)
+        ON DELETE RESTRICT,
+
+    CONSTRAINT fk_mov_deuda_trans
+        FOREIGN KEY (transaccion_id)
+        REFERENCES transacciones(transaccion_id)
+        ON DELETE RESTRICT
+) PARTITION BY RANGE (fecha);
+
+-- La secuencia del id pasa a la nueva tabla (si no, se borraría con la antigua)
+ALTER SEQUENCE movimientos_deuda_movimiento_deuda_id_seq
+    OWNED BY movimientos_deuda.movimiento_deuda_id;
+
+CREATE TABLE movimientos_deuda_default PARTITION OF movimientos_deuda DEFAULT;
+
+DO $$
+DECLARE
+    v_desde DATE;
+BEGIN
+    SELECT COALESCE(MIN(fecha), NOW())::DATE INTO v_desde FROM movimientos_deuda_sin_particionar;
+    PERFORM crear_particiones_mensuales(
+        'movimientos_deuda',
+        v_desde,
+        ((EXTRACT(YEAR FROM AGE(date_trunc('month', NOW()), date_trunc('month', v_desde))) * 12
+          + EXTRACT(MONTH FROM AGE(date_trunc('month', NOW()), date_trunc('month', v_desde))))::INTEGER + 12)
+    );
+END;
+$$;
+
+-- Copia de datos antes de crear los triggers (los saldos ya están aplicados)
+INSERT INTO movimientos_deuda SELECT * FROM movimientos_deuda_sin_particionar;
+
+DROP TABLE movimientos_deuda_sin_particionar;
+
+
+CREATE INDEX idx_mov_deuda_deuda
+ON movimientos_deuda(deuda_id, fecha DESC);
+
+CREATE INDEX idx_mov_deuda_transaccion
+ON movimientos_deuda(transaccion_id);
+
+CREATE INDEX idx_mov_deuda_tipo
+ON movimientos_deuda(tipo, fecha DESC);
+
+CREATE INDEX idx_mov_deuda_fecha
+ON movimientos_deuda(fecha DESC);
+
+CREATE TRIGGER trigger_actualizar_saldo_deuda
+    AFTER INSERT OR UPDATE OR DELETE ON movimientos_deuda
+    FOR EACH ROW
+    EXECUTE FUNCTION actualizar_saldo_deuda_trigger();
+
+-- ============ MOVIMIENTOS DE SUBCUENTA ============
+
+ALTER TABLE movimientos_subcuenta RENAME TO movimientos_subcuenta_sin_particionar;
+ALTER TABLE movimientos_subcuenta_sin_particionar RENAME CONSTRAINT movimientos_subcuenta_pkey TO movimientos_subcuenta_sin_particionar_pkey;
+ALTER TABLE movimientos_subcuenta_sin_particionar RENAME CONSTRAINT fk_mov_subcuenta TO fk_mov_subcuenta_sin_particionar;
+ALTER TABLE movimientos_subcuenta_sin_particionar RENAME CONSTRAINT fk_mov_subcuenta_destino TO fk_mov_subcuenta_destino_sin_particionar;
+ALTER TABLE movimientos_subcuenta_sin_particionar RENAME CONSTRAINT fk_mov_transaccion TO fk_mov_transaccion_sin_particionar;
+
+CREATE TABLE movimientos_subcuenta (
+    LIKE movimientos_subcuenta_sin_particionar INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING COMMENTS,
+
+    CONSTRAINT movimientos_subcuenta_pkey
+        PRIMARY KEY (movimiento_subcuenta_id, fecha),
+
+    CONSTRAINT fk_mov_subcuenta
+        FOREIGN KEY (subcuenta_id)
+        REFERENCES subcuentas(subcuenta_id)
+        ON DELETE RESTRICT,
+
+    CONSTRAINT fk_mov_subcuenta_destino
+        FOREIGN KEY (subcuenta_destino_id)
+        REFERENCES subcuentas(subcuenta_id)
+        ON DELETE RESTRICT,
+
+    CONSTRAINT fk_mov_transaccion
+        FOREIGN KEY (transaccion_id)
+        REFERENCES transacciones(transaccion_id)
+        ON DELETE RESTRICT
+) PARTITION BY RANGE (fecha);
+
+ALTER SEQUENCE movimientos_subcuenta_movimiento_subcuenta_id_seq
+    OWNED BY movimientos_subcuenta.movimiento_subcuenta_id;
+
+CREATE TABLE movimientos_subcuenta_default PARTITION OF movimientos_subcuenta DEFAULT;
+
+DO $$
+DECLARE
+    v_desde DATE;
+BEGIN
+    SELECT COALESCE(MIN(fecha), NOW())::DATE INTO v_desde FROM movimientos_subcuenta_sin_particionar;
+    PERFORM crear_particiones_mensuales(
+        'movimientos_subcuenta',
+        v_desde,
+        ((EXTRACT(YEAR FROM AGE(date_trunc('month', NOW()), date_trunc('month', v_desde))) * 12
+          + EXTRACT(MONTH FROM AGE(date_trunc('month', NOW()), date_trunc('month', v_desde))))::INTEGER + 12)
+    );
+END;
+$$;
+
+INSERT INTO movimientos_subcuenta SELECT * FROM movimientos_subcuenta_sin_particionar;
+
+DROP TABLE movimientos_subcuenta_sin_particionar;
+
+
+CREATE INDEX idx_mov_subcuenta_subcuenta
+ON movimientos_subcuenta(subcuenta_id, fecha DESC);
+
+CREATE INDEX idx_mov_subcuenta_transaccion
+ON movimientos_subcuenta(transaccion_id);
+
+CREATE INDEX idx_mov_subcuenta_tipo_fecha
+ON movimientos_subcuenta(tipo, fecha DESC);
+
+CREATE INDEX idx_mov_subcuenta_fecha
+ON movimientos_subcuenta(fecha DESC);
+
+-- Un UPDATE que cambia de mes se ejecuta como DELETE + INSERT entre
+-- particiones: con los triggers separados de V007 (BEFORE UPDATE, BEFORE
+-- DELETE y AFTER INSERT) el movimiento se revertía y aplicaba dos veces.
+-- Un único trigger AFTER revierte OLD y aplica NEW una sola vez por fila.
+CREATE OR REPLACE FUNCTION actualizar_saldo_subcuenta_trigger()
+RETURNS TRIGGER AS $$
+BEGIN
+    -- Revertir el movimiento anterior
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        IF OLD.tipo IN ('ASIGNACION', 'AJUSTE') THEN
+            UPDATE subcuentas 
+            SET saldo_actual = saldo_actual - OLD.monto
+            WHERE subcuenta_id = OLD.subcuenta_id;
+            
+        ELSIF OLD.tipo = 'GASTO' THEN
+            UPDATE subcuentas 
+            SET saldo_actual = saldo_actual + OLD.monto
+            WHERE subcuenta_id = OLD.subcuenta_id;
+            
+        ELSIF OLD.tipo = 'TRANSFERENCIA' THEN
+            -- Devolver fondos a la subcuenta origen
+            UPDATE subcuentas 
+            SET saldo_actual = saldo_actual + OLD.monto
+            WHERE subcuenta_id = OLD.subcuenta_id;
+            
+            -- Restar de la subcuenta destino
+            UPDATE subcuentas 
+            SET saldo_actual = saldo_actual - OLD.monto
+            WHERE subcuenta_id = OLD.subcuenta_destino_id;
+        END IF;
+    END IF;
+    
+    -- Aplicar el nuevo movimiento (en AJUSTE el monto ya trae el signo)
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        IF NEW.tipo IN ('ASIGNACION', 'AJUSTE') THEN
+            UPDATE subcuentas 
+            SET saldo_actual = saldo_actual + NEW.monto
+            WHERE subcuenta_id = NEW.subcuenta_id;
+            
+        ELSIF NEW.tipo = 'GASTO' THEN
+            UPDATE subcuentas 
+            SET saldo_actual = saldo_actual - NEW.monto
+            WHERE subcuenta_id = NEW.subcuenta_id;
+            
+        ELSIF NEW.tipo = 'TRANSFERENCIA' THEN
+            -- Restar de la subcuenta origen
+            UPDATE subcuentas 
+            SET saldo_actual = saldo_actual - NEW.monto
+            WHERE subcuenta_id = NEW.subcuenta_id;
+            
+            -- Sumar a la subcuenta destino
+            UPDATE subcuentas 
+            SET saldo_actual = saldo_actual + NEW.monto
+            WHERE subcuenta_id = NEW.subcuenta_destino_id;
+        END IF;
+    END IF;
+    
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trigger_actualizar_saldo_subcuenta
+    AFTER INSERT OR UPDATE OR DELETE ON movimientos_subcuenta
+    FOR EACH ROW
+    EXECUTE FUNCTION actualizar_saldo_subcuenta_trigger();
+
+CREATE TRIGGER trigger_timestamp_movimiento_subcuenta
+    BEFORE UPDATE ON movimientos_subcuenta
+    FOR EACH ROW
+    EXECUTE FUNCTION actualizar_timestamp_movimiento_subcuenta();
+
+-- Reemplazadas por actualizar_saldo_subcuenta_trigger()
+DROP FUNCTION aplicar_movimiento_subcuenta();
+DROP FUNCTION actualizar_movimiento_subcuenta();
+DROP FUNCTION eliminar_movimiento_subcuenta();
+
+-- ============ RECREAR VISTAS ============
+
+CREATE VIEW vista_movimientos_deuda_detalle AS
+SELECT
+    md.movimiento_deuda_id,
+    md.deuda_id,
+    d.tipo AS tipo_deuda,
+    COALESCE(d.acreedor, d.deudor) AS contraparte,
+    d.descripcion AS descripcion_deuda,
+    md.transaccion_id,
+    md.fecha,
+    md.tipo AS tipo_movimiento,
+    md.monto,
+    md.capital_pagado,
+    md.interes_pagado,
+    md.interes_generado,
+    md.descripcion,
+    d.saldo_actual AS saldo_deuda_actual,
+    d.estado AS estado_deuda,
+    md.creado_en
+FROM movimientos_deuda md
+INNER JOIN deudas d ON md.deuda_id = d.deuda_id
+ORDER BY md.fecha DESC;
+
+CREATE VIEW vista_movimientos_subcuenta_detalle AS
+SELECT
+    ms.movimiento_subcuenta_id,
+    ms.subcuenta_id,
+    s.nombre AS subcuenta_nombre,
+    ms.subcuenta_destino_id,
+    sd.nombre AS subcuenta_destino_nombre,
+    s.cuenta_id,
+    c.nombre AS cuenta_nombre,
+    c.usuario_id,
+    ms.transaccion_id,
+    t.tipo AS tipo_transaccion,
+    ms.fecha,
+    ms.tipo AS tipo_movimiento,
+    ms.monto,
+    ms.descripcion,
+    s.saldo_actual AS saldo_subcuenta_actual,
+    s.monto_meta AS meta_subcuenta,
+    ms.creado_en
+FROM movimientos_subcuenta ms
+INNER JOIN subcuentas s ON ms.subcuenta_id = s.subcuenta_id
+INNER JOIN cuentas c ON s.cuenta_id = c.cuenta_id
+LEFT JOIN subcuentas sd ON ms.subcuenta_destino_id = sd.subcuenta_id
+LEFT JOIN transacciones t ON ms.transaccion_id = t.transaccion_id
+ORDER BY ms.fecha DESC;
+
+-- ============ COMENTARIOS ============
+COMMENT ON TABLE movimientos_deuda IS 'Registro de movimientos de deudas (cargos, pagos, ajustes). Particionada por mes (fecha)';
+COMMENT ON TABLE movimientos_subcuenta IS 'Registro de movimientos de fondos en subcuentas (EDITABLES y ELIMINABLES). Particionada por mes (fecha)';
+COMMENT ON FUNCTION crear_particiones_mensuales(TEXT, DATE, INTEGER) IS 'Crea las particiones mensuales que falten de una tabla particionada por fecha, moviendo las filas de ese mes que estén en DEFAULT';
+COMMENT ON FUNCTION actualizar_saldo_subcuenta_trigger() IS 'Mantiene subcuentas.saldo_actual; un solo trigger AFTER para que mover una fila de partición no aplique el movimiento dos veces';
@@ -0,0 +1,36 @@
+-- =====================================================
+-- MIGRACIÓN: índices BRIN sobre columnas de fecha
+-- Descripción: Los movimientos y las columnas de auditoría se
+--              insertan prácticamente en orden de fecha, así que un
+--              índice BRIN (mín/máx por rango de páginas) filtra por
+--              rango igual de bien que un BTREE ocupando una fracción
+--              mínima del espacio.
+--              Los índices compuestos (deuda_id/subcuenta_id, fecha)
+--              se mantienen: siguen siendo BTREE.
+-- Dependencias: movimientos_deuda, movimientos_subcuenta,
+--               cuentas, deudas
+-- =====================================================
+
+-- ============ MOVIMIENTOS ============
+-- Reemplazan a los BTREE sobre (fecha DESC)
+DROP INDEX IF EXISTS idx_mov_deuda_fecha;
+DROP INDEX IF EXISTS idx_mov_subcuenta_fecha;
+
+CREATE INDEX IF NOT EXISTS idx_mov_deuda_fecha_brin
+ON movimientos_deuda USING BRIN (fecha) WITH (pages_per_range = 32);
+
+CREATE INDEX IF NOT EXISTS idx_mov_subcuenta_fecha_brin
+ON movimientos_subcuenta USING BRIN (fecha) WITH (pages_per_range = 32);
+
+-- ============ AUDITORÍA ============
+CREATE INDEX IF NOT EXISTS idx_cuentas_creada_en_brin
+ON cuentas USING BRIN (creada_en) WITH (pages_per_range = 32);
+
+CREATE INDEX IF NOT EXISTS idx_deudas_creada_en_brin
+ON deudas USING BRIN (creada_en) WITH (pages_per_range = 32);
+
+-- ============ COMENTARIOS ============
+COMMENT ON INDEX idx_mov_deuda_fecha_brin IS 'Movimientos de deuda por rango de fecha (BRIN)';
+COMMENT ON INDEX idx_mov_subcuenta_fecha_brin IS 'Movimientos de subcuenta por rango de fecha (BRIN)';
+COMMENT ON INDEX idx_cuentas_creada_en_brin IS 'Cuentas por fecha de creación (BRIN)';
+COMMENT ON INDEX idx_deudas_creada_en_brin IS 'Deudas por fecha de creación (BRIN)';
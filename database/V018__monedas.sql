@@ -0,0 +1,214 @@
+-- =====================================================
+-- TABLA: monedas
+-- Descripción: Catálogo de monedas ISO 4217. Reemplaza la
+--              validación por expresión regular de cuentas.moneda y
+--              usuarios.moneda_principal por una clave foránea:
+--              solo se aceptan códigos que existen de verdad y la
+--              comprobación es una búsqueda por clave primaria.
+-- Dependencias: usuarios, cuentas
+-- =====================================================
+
+CREATE TABLE monedas (
+    codigo              CHAR(3) PRIMARY KEY,
+    nombre              VARCHAR(100) NOT NULL,
+
+    -- ============ CONSTRAINTS ============
+
+    -- El formato se valida una sola vez, en el catálogo
+    CONSTRAINT check_codigo_iso
+        CHECK (codigo ~ '^[A-Z]{3}$')
+);
+
+-- ============ DATOS INICIALES (ISO 4217) ============
+INSERT INTO monedas (codigo, nombre) VALUES
+    ('AED', 'Dírham de los Emiratos Árabes Unidos'),
+    ('AFN', 'Afgani afgano'),
+    ('ALL', 'Lek albanés'),
+    ('AMD', 'Dram armenio'),
+    ('ANG', 'Florín antillano neerlandés'),
+    ('AOA', 'Kwanza angoleño'),
+    ('ARS', 'Peso argentino'),
+    ('AUD', 'Dólar australiano'),
+    ('AWG', 'Florín arubeño'),
+    ('AZN', 'Manat azerbaiyano'),
+    ('BAM', 'Marco convertible de Bosnia y Herzegovina'),
+    ('BBD', 'Dólar de Barbados'),
+    ('BDT', 'Taka de Bangladés'),
+    ('BGN', 'Lev búlgaro'),
+    ('BHD', 'Dinar bareiní'),
+    ('BIF', 'Franco de Burundi'),
+    ('BMD', 'Dólar bermudeño'),
+    ('BND', 'Dólar de Brunéi'),
+    ('BOB', 'Boliviano'),
+    ('BRL', 'Real brasileño'),
+    ('BSD', 'Dólar bahameño'),
+    ('BTN', 'Ngultrum butanés'),
+    ('BWP', 'Pula de Botsuana'),
+    ('BYN', 'Rublo bielorruso'),
+    ('BZD', 'Dólar beliceño'),
+    ('CAD', 'Dólar canadiense'),
+    ('CDF', 'Franco congoleño'),
+    ('CHF', 'Franco suizo'),
+    ('CLP', 'Peso chileno'),
+    ('CNY', 'Yuan chino'),
+    ('COP', 'Peso colombiano'),
+    ('CRC', 'Colón costarricense'),
+    ('CUP', 'Peso cubano'),
+    ('CVE', 'Escudo caboverdiano'),
+    ('CZK', 'Corona checa'),
+    ('DJF', 'Franco yibutiano'),
+    ('DKK', 'Corona danesa'),
+    ('DOP', 'Peso dominicano'),
+    ('DZD', 'Dinar argelino'),
+    ('EGP', 'Libra egipcia'),
+    ('ERN', 'Nakfa eritreo'),
+    ('ETB', 'Birr etíope'),
+    ('EUR', 'Euro'),
+    ('FJD', 'Dólar fiyiano'),
+    ('FKP', 'Libra malvinense'),
+    ('GBP', 'Libra esterlina'),
+    ('GEL', 'Lari georgiano'),
+    ('GHS', 'Cedi ghanés'),
+    ('GIP', 'Libra de Gibraltar'),
+    ('GMD', 'Dalasi gambiano'),
+    ('GNF', 'Franco guineano'),
+    ('GTQ', 'Quetzal guatemalteco'),
+    ('GYD', 'Dólar guyanés'),
+    ('HKD', 'Dólar de Hong Kong'),
+    ('HNL', 'Lempira hondureño'),
+    ('HTG', 'Gourde haitiano'),
+    ('HUF', 'Forinto húngaro'),
+    ('IDR', 'Rupia indonesia'),
+    ('ILS', 'Nuevo séquel israelí'),
+    ('INR', 'Rupia india'),
+    ('IQD', 'Dinar iraquí'),
+    ('IRR', 'Rial iraní'),
+    ('ISK', 'Corona islandesa'),
+    ('JMD', 'Dólar jamaiquino'),
+    ('JOD', 'Dinar jordano'),
+    ('JPY', 'Yen japonés'),
+    ('KES', 'Chelín keniano'),
+    ('KGS', 'Som kirguís'),
+    ('KHR', 'Riel camboyano'),
+    ('KMF', 'Franco comorense'),
+    ('KPW', 'Won norcoreano'),
+    ('KRW', 'Won surcoreano'),
+    ('KWD', 'Dinar kuwaití'),
+    ('KYD', 'Dólar de las Islas Caimán'),
+    ('KZT', 'Tenge kazajo'),
+    ('LAK', 'Kip laosiano'),
+    ('LBP', 'Libra libanesa'),
+    ('LKR', 'Rupia de Sri Lanka'),
+    ('LRD', 'Dólar liberiano'),
+    ('LSL', 'Loti lesotense'),
+    ('LYD', 'Dinar libio'),
+    ('MAD', 'Dírham marroquí'),
+    ('MDL', 'Leu moldavo'),
+    ('MGA', 'Ariary malgache'),
+    ('MKD', 'Denar macedonio'),
+    ('MMK', 'Kyat birmano'),
+    ('MNT', 'Tugrik mongol'),
+    ('MOP', 'Pataca de Macao'),
+    ('MRU', 'Uguiya mauritana'),
+    ('MUR', 'Rupia mauriciana'),
+    ('MVR', 'Rufiyaa maldiva'),
+    ('MWK', 'Kwacha malauí'),
+    ('MXN', 'Peso mexicano'),
+    ('MYR', 'Ringgit malayo'),
+    ('MZN', 'Metical mozambiqueño'),
+    ('NAD', 'Dólar namibio'),
+    ('NGN', 'Naira nigeriano'),
+    ('NIO', 'Córdoba nicaragüense'),
+    ('NOK', 'Corona noruega'),
+    ('NPR', 'Rupia nepalí'),
+    ('NZD', 'Dólar neozelandés'),
+    ('OMR', 'Rial omaní'),
+    ('PAB', 'Balboa panameño'),
+    ('PEN', 'Sol peruano'),
+    ('PGK', 'Kina de Papúa Nueva Guinea'),
+    ('PHP', 'Peso filipino'),
+    ('PKR', 'Rupia pakistaní'),
+    ('PLN', 'Esloti polaco'),
+    ('PYG', 'Guaraní paraguayo'),
+    ('QAR', 'Rial catarí'),
+    ('RON', 'Leu rumano'),
+    ('RSD', 'Dinar serbio'),
+    ('RUB', 'Rublo ruso'),
+    ('RWF', 'Franco ruandés'),
+    ('SAR', 'Riyal saudí'),
+    ('SBD', 'Dólar de las Islas Salomón'),
+    ('SCR', 'Rupia seychelense'),
+    ('SDG', 'Libra sudanesa'),
+    ('SEK', 'Corona sueca'),
+    ('SGD', 'Dólar de Singapur'),
+    ('SHP', 'Libra de Santa Elena'),
+    ('SLE', 'Leone de Sierra Leona'),
+    ('SOS', 'Chelín somalí'),
+    ('SRD', 'Dólar surinamés'),
+    ('SSP', 'Libra sursudanesa'),
+    ('STN', 'Dobra santotomense'),
+    ('SVC', 'Colón salvadoreño'),
+    ('SYP', 'Libra siria'),
+    ('SZL', 'Lilangeni suazi'),
+    ('THB', 'Baht tailandés'),
+    ('TJS', 'Somoni tayiko'),
+    ('TMT', 'Manat turcomano'),
+    ('TND', 'Dinar tunecino'),
+    ('TOP', 'Paʻanga tongano'),
+    ('TRY', 'Lira turca'),
+    ('TTD', 'Dólar de Trinidad y Tobago'),
+    ('TWD', 'Nuevo dólar taiwanés'),
+    ('TZS', 'Chelín tanzano'),
+    ('UAH', 'Grivna ucraniana'),
+    ('UGX', 'Chelín ugandés'),
+    ('USD', 'Dólar estadounidense'),
+    ('UYU', 'Peso uruguayo'),
+    ('UZS', 'Som uzbeko'),
+    ('VES', 'Bolívar venezolano'),
+    ('VND', 'Dong vietnamita'),
+    ('VUV', 'Vatu vanuatuense'),
+    ('WST', 'Tala samoano'),
+    ('XAF', 'Franco CFA de África Central'),
+    ('XCD', 'Dólar del Caribe Oriental'),
+    ('XOF', 'Franco CFA de África Occidental'),
+    ('XPF', 'Franco CFP'),
+    ('YER', 'Rial yemení'),
+    ('ZAR', 'Rand sudafricano'),
+    ('ZMW', 'Kwacha zambiano'),
+    ('ZWL', 'Dólar zimbabuense');
+
+-- Códigos ya usados que no estén en la lista (p. ej. monedas retiradas),
+-- para que las claves foráneas no fallen sobre datos existentes
+INSERT INTO monedas (codigo, nombre)
+SELECT codigo, codigo
+FROM (
+    SELECT moneda AS codigo FROM cuentas
+    UNION
+    SELECT moneda_principal FROM usuarios
+) AS usadas
+ON CONFLICT (codigo) DO NOTHING;
+
+-- ============ CLAVES FORÁNEAS ============
+-- Sustituyen a la expresión regular (el formato ya lo garantiza el catálogo)
+
+ALTER TABLE cuentas DROP CONSTRAINT check_moneda_iso;
+ALTER TABLE usuarios DROP CONSTRAINT check_moneda_iso;
+
+ALTER TABLE cuentas
+    ADD CONSTRAINT fk_cuenta_moneda
+        FOREIGN KEY (moneda)
+        REFERENCES monedas(codigo)
+        ON UPDATE CASCADE
+        ON DELETE RESTRICT;
+
+ALTER TABLE usuarios
+    ADD CONSTRAINT fk_usuario_moneda
+        FOREIGN KEY (moneda_principal)
+        REFERENCES monedas(codigo)
+        ON UPDATE CASCADE
+        ON DELETE RESTRICT;
+
+-- ============ COMENTARIOS ============
+COMMENT ON TABLE monedas IS 'Catálogo de monedas ISO 4217';
+COMMENT ON COLUMN monedas.codigo IS 'Código ISO 4217 de 3 letras (USD, EUR, MXN, etc.)';
+COMMENT ON COLUMN monedas.nombre IS 'Nombre de la moneda';
@@ -0,0 +1,53 @@
+-- =====================================================
+-- MIGRACIÓN: validación de color_hex en una función compartida
+-- Descripción: La expresión regular de check_color_hex_valido estaba
+--              repetida en seis tablas. Se centraliza en
+--              es_color_hex(), que valida #RRGGBB (mayúsculas, ver
+--              V014) comparando caracteres, sin motor de expresiones
+--              regulares. Es IMMUTABLE y en SQL puro, así que el
+--              planificador la puede expandir en línea.
+-- Dependencias: categorias, cuentas, subcuentas, deudas,
+--               gastos_planificados, compromisos_recurrentes
+-- =====================================================
+
+-- ============ FUNCIÓN ============
+
+CREATE OR REPLACE FUNCTION es_color_hex(p_color TEXT)
+RETURNS BOOLEAN AS $$
+    SELECT LENGTH(p_color) = 7
+       AND LEFT(p_color, 1) = '#'
+       AND TRANSLATE(SUBSTR(p_color, 2), '0123456789ABCDEF', '') = '';
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE;
+
+-- ============ CATEGORÍAS ============
+ALTER TABLE categorias DROP CONSTRAINT check_color_hex_valido;
+ALTER TABLE categorias ADD CONSTRAINT check_color_hex_valido
+    CHECK (es_color_hex(color_hex));
+
+-- ============ CUENTAS ============
+ALTER TABLE cuentas DROP CONSTRAINT check_color_hex_valido;
+ALTER TABLE cuentas ADD CONSTRAINT check_color_hex_valido
+    CHECK (es_color_hex(color_hex));
+
+-- ============ SUBCUENTAS ============
+ALTER TABLE subcuentas DROP CONSTRAINT check_color_hex_valido;
+ALTER TABLE subcuentas ADD CONSTRAINT check_color_hex_valido
+    CHECK (es_color_hex(color_hex));
+
+-- ============ DEUDAS ============
+ALTER TABLE deudas DROP CONSTRAINT check_color_hex_valido;
+ALTER TABLE deudas ADD CONSTRAINT check_color_hex_valido
+    CHECK (es_color_hex(color_hex));
+
+-- ============ GASTOS PLANIFICADOS ============
+ALTER TABLE gastos_planificados DROP CONSTRAINT check_color_hex_valido;
+ALTER TABLE gastos_planificados ADD CONSTRAINT check_color_hex_valido
+    CHECK (es_color_hex(color_hex));
+
+-- ============ COMPROMISOS RECURRENTES ============
+ALTER TABLE compromisos_recurrentes DROP CONSTRAINT check_color_hex_valido;
+ALTER TABLE compromisos_recurrentes ADD CONSTRAINT check_color_hex_valido
+    CHECK (es_color_hex(color_hex));
+
+-- ============ COMENTARIOS ============
+COMMENT ON FUNCTION es_color_hex(TEXT) IS 'Indica si el texto es un color #RRGGBB en mayúsculas';
@@ -0,0 +1,33 @@
+-- =====================================================
+-- MIGRACIÓN: estadísticas de consultas con pg_stat_statements
+-- Descripción: Registra tiempo total, llamadas y filas por consulta
+--              normalizada, para decidir qué optimizar (tamaño del
+--              pool, índices, consultas a precompilar). La extensión
+--              solo recoge datos si el servidor arranca con
+--              shared_preload_libraries = 'pg_stat_statements'
+--              (ver docker-compose.yml).
+-- Dependencias: ninguna
+-- =====================================================
+
+-- ============ EXTENSIÓN ============
+CREATE EXTENSION IF NOT EXISTS pg_stat_statements;
+
+-- ============ VISTAS ============
+
+-- Consultas que más tiempo acumulado consumen en esta base de datos
+CREATE OR REPLACE VIEW consultas_mas_costosas AS
+SELECT
+    s.queryid,
+    s.calls AS llamadas,
+    ROUND(s.total_exec_time::NUMERIC, 2) AS tiempo_total_ms,
+    ROUND(s.mean_exec_time::NUMERIC, 3) AS tiempo_medio_ms,
+    s.rows AS filas,
+    s.shared_blks_hit + s.shared_blks_read AS bloques_leidos,
+    s.query AS consulta
+FROM pg_stat_statements s
+JOIN pg_database d ON d.oid = s.dbid
+WHERE d.datname = current_database()
+ORDER BY s.total_exec_time DESC;
+
+-- ============ COMENTARIOS ============
+COMMENT ON VIEW consultas_mas_costosas IS 'Consultas ordenadas por tiempo total de ejecución (pg_stat_statements)';
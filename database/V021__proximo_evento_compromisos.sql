@@ -0,0 +1,72 @@
+-- =====================================================
+-- MIGRACIÓN: próximo evento de los compromisos calculado una vez
+-- Descripción: vista_compromisos_estado repetía seis veces el CASE de
+--              la frecuencia para obtener proximo_evento,
+--              dias_hasta_proximo y evento_pendiente. Ahora la fecha se
+--              calcula una sola vez por fila (LATERAL) y se devuelve
+--              como DATE, el tipo que declaran el esquema de la API y
+--              eventos_compromisos_pendientes(). Antes, con TIMESTAMP,
+--              esa función fallaba con "structure of query does not
+--              match function result type".
+-- Dependencias: V015__tipos_enum.sql
+-- =====================================================
+
+-- ============ FUNCIONES ============
+
+-- Intervalo entre dos eventos de un compromiso
+CREATE OR REPLACE FUNCTION intervalo_frecuencia(p_frecuencia frecuencia_compromiso_enum)
+RETURNS INTERVAL AS $$
+    SELECT CASE p_frecuencia
+        WHEN 'DIARIA' THEN INTERVAL '1 day'
+        WHEN 'SEMANAL' THEN INTERVAL '7 days'
+        WHEN 'QUINCENAL' THEN INTERVAL '15 days'
+        WHEN 'MENSUAL' THEN INTERVAL '1 month'
+        WHEN 'BIMESTRAL' THEN INTERVAL '2 months'
+        WHEN 'TRIMESTRAL' THEN INTERVAL '3 months'
+        WHEN 'SEMESTRAL' THEN INTERVAL '6 months'
+        WHEN 'ANUAL' THEN INTERVAL '1 year'
+    END
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE;
+
+-- ============ VISTAS ============
+
+-- El tipo de proximo_evento cambia (TIMESTAMP -> DATE): no basta con CREATE OR REPLACE
+DROP VIEW IF EXISTS vista_compromisos_estado;
+
+CREATE VIEW vista_compromisos_estado AS
+SELECT
+    cr.compromiso_id,
+    cr.usuario_id,
+    u.nombre || ' ' || u.apellido AS usuario_nombre,
+    cr.descripcion,
+    cr.tipo,
+    cr.categoria,
+    cr.monto,
+    cr.frecuencia,
+    cr.dia_pago,
+    pe.proximo_evento,
+    pe.proximo_evento - CURRENT_DATE AS dias_hasta_proximo,
+    pe.proximo_evento <= CURRENT_DATE AS evento_pendiente,
+    cr.cuenta_destino_id,
+    c.nombre AS cuenta_destino_nombre,
+    cr.activo,
+    cr.auto_generar,
+    cr.fecha_inicio,
+    cr.fecha_fin,
+    cr.ultimo_evento,
+    cr.color_hex,
+    cr.icono,
+    cr.notas,
+    cr.creado_en
+FROM compromisos_recurrentes cr
+INNER JOIN usuarios u ON cr.usuario_id = u.usuario_id
+LEFT JOIN cuentas c ON cr.cuenta_destino_id = c.cuenta_id
+-- Sin eventos previos se cuenta desde la fecha de inicio
+CROSS JOIN LATERAL (
+    SELECT (COALESCE(cr.ultimo_evento, cr.fecha_inicio) + intervalo_frecuencia(cr.frecuencia))::DATE AS proximo_evento
+) pe
+ORDER BY pe.proximo_evento NULLS LAST;
+
+-- ============ COMENTARIOS ============
+COMMENT ON FUNCTION intervalo_frecuencia(frecuencia_compromiso_enum) IS 'Intervalo entre eventos según la frecuencia del compromiso';
+COMMENT ON VIEW vista_compromisos_estado IS 'Compromisos recurrentes con su próximo evento (DATE) y días restantes';